@@ -0,0 +1,193 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import signal
+import sys
+import threading
+import time
+
+from heuristics import HEURISTICS, PatternDatabase
+from packed_board import board_from_grid
+from solver import SEARCH_MODES
+from solvability import is_solvable
+from stats import SearchStats
+
+# Batch solver: reads many puzzles, screens them with is_solvable, solves the rest on a
+# process pool and appends one JSON line per instance to the output as soon as it finishes.
+# Instances already present in the output are skipped, so an interrupted run can be resumed
+# by running the same command again.
+#
+# Input is either the main.py format repeated (k, then k rows; blank lines ignored) or
+# JSON lines of the form {"id": ..., "grid": [[...], ...]}. A malformed puzzle gets an
+# 'error' record like any instance that fails, and the rest of the input is still solved.
+
+
+class SearchTimeout(Exception):
+    pass
+
+# Yields (id, grid, error) per puzzle; grid is None and error says why when a puzzle
+# cannot be parsed
+def read_puzzles(stream):
+    index = 0
+    lines = (line.strip() for line in stream)
+    for line in lines:
+        if not line:
+            continue
+        puzzle_id, grid, error = str(index), None, None
+        if line.startswith('{'):
+            try:
+                record = json.loads(line)
+                puzzle_id = str(record.get('id', index))
+                grid = record['grid']
+            except (ValueError, KeyError, AttributeError) as e:
+                error = f"malformed JSON puzzle: {e!r}"
+        else:
+            try:
+                k = int(line)
+            except ValueError:
+                error = f"expected a grid size, got {line[:40]!r}"
+            else:
+                # the k rows are consumed even when one is malformed, so the next puzzle starts in step
+                rows = []
+                while len(rows) < k:
+                    row = next(lines, None)
+                    if row is None:
+                        error = f"puzzle ends after {len(rows)} of {k} rows"
+                        break
+                    if row:
+                        rows.append(row)
+                if error is None:
+                    try:
+                        grid = [list(map(int, row.split())) for row in rows]
+                    except ValueError as e:
+                        error = f"malformed row: {e}"
+        yield puzzle_id, grid, error
+        index += 1
+
+# Raises ValueError unless grid is k rows of k cells holding 0..k*k-1 once each
+def check_grid(grid):
+    k = len(grid)
+    if k == 0 or any(not isinstance(row, list) or len(row) != k for row in grid):
+        raise ValueError(f"grid is not {k}x{k}")
+    if sorted(val for row in grid for val in row) != list(range(k * k)):
+        raise ValueError(f"grid does not hold the tiles 0..{k*k-1} once each")
+
+def get_heuristic(name, k):
+    if name == 'pdb':
+        return PatternDatabase(k)
+    return HEURISTICS[name]
+
+def _on_alarm(signum, frame):
+    raise SearchTimeout()
+
+def solve_instance(task):
+    puzzle_id, grid, heuristic_name, solver_name, time_limit, memory_limit_mb, with_stats = task
+    record = {'id': puzzle_id, 'k': len(grid), 'heuristic': heuristic_name, 'solver': solver_name,
+              'status': 'solved', 'cost': None, 'explored': None, 'expanded': None}
+    # each worker process handles a single instance (maxtasksperchild=1), so the limits
+    # and the peak RSS below are per instance
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if time_limit:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+    stats = SearchStats(puzzle_id) if with_stats else None
+    start = time.perf_counter()
+    try:
+        heuristic = get_heuristic(heuristic_name, len(grid))
+        search = SEARCH_MODES[solver_name]
+        options = {'stats': stats} if stats is not None else {}
+        path, cost, explored, expanded = search(initial_state=board_from_grid(grid),
+                                                heuristic_func=heuristic, **options)
+        record.update(cost=cost, explored=explored, expanded=expanded)
+        if stats is not None:
+            record['stats'] = stats.to_dict()
+    except SearchTimeout:
+        record['status'] = 'timeout'
+    except MemoryError:
+        record['status'] = 'memory'
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = str(e)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    record['wall_time'] = round(time.perf_counter() - start, 6)
+    # ru_maxrss is in kilobytes on Linux
+    record['peak_memory_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return record
+
+def completed_ids(output_path):
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path) as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)['id'])
+            except (ValueError, KeyError):
+                # a line cut short by an interrupted run; that instance is solved again
+                continue
+    return done
+
+def run_batch(stream, output_path, heuristic_name, solver_name, workers=None,
+              time_limit=None, memory_limit_mb=None, with_stats=False):
+    done = completed_ids(output_path)
+    # the pool feeds tasks() from its own thread, so unsolvable records race with results
+    lock = threading.Lock()
+    with open(output_path, 'a') as out:
+        def emit(record):
+            with lock:
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+
+        def tasks():
+            prepared = set()
+            for puzzle_id, grid, error in read_puzzles(stream):
+                if puzzle_id in done:
+                    continue
+                record = {'id': puzzle_id, 'k': len(grid) if isinstance(grid, list) else None,
+                          'heuristic': heuristic_name, 'solver': solver_name}
+                try:
+                    if error is not None:
+                        raise ValueError(error)
+                    check_grid(grid)
+                    if not is_solvable(board_from_grid(grid)):
+                        emit(dict(record, status='unsolvable'))
+                        continue
+                    if heuristic_name == 'pdb' and len(grid) not in prepared:
+                        # build missing tables once here rather than in every worker
+                        PatternDatabase(len(grid))
+                        prepared.add(len(grid))
+                except Exception as e:
+                    emit(dict(record, status='error', error=str(e) if isinstance(e, ValueError) else repr(e)))
+                    continue
+                yield puzzle_id, grid, heuristic_name, solver_name, time_limit, memory_limit_mb, with_stats
+
+        with multiprocessing.Pool(processes=workers, maxtasksperchild=1) as pool:
+            for record in pool.imap_unordered(solve_instance, tasks()):
+                emit(record)
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve many n-puzzles in parallel, streaming JSONL results")
+    parser.add_argument('input', help="puzzle file, or - for stdin")
+    parser.add_argument('-o', '--output', required=True, help="JSONL results file (appended to, resumable)")
+    parser.add_argument('--heuristic', choices=list(HEURISTICS) + ['pdb'], default='manhattan',
+                        help="pdb builds missing tables before solving: seconds for k=3, but 10-15 "
+                             "minutes per 6-tile table for k=4 (prebuild with heuristics/pattern_database.py)")
+    parser.add_argument('--solver', choices=SEARCH_MODES, default='astar')
+    parser.add_argument('--workers', type=int, default=None, help="pool size (default: CPU count)")
+    parser.add_argument('--time-limit', type=float, default=None, help="seconds per instance")
+    parser.add_argument('--memory-limit', type=int, default=None, help="MB of address space per instance")
+    parser.add_argument('--stats', action='store_true', help="add search timings and f histograms to each record")
+    args = parser.parse_args()
+
+    stream = sys.stdin if args.input == '-' else open(args.input)
+    with stream:
+        run_batch(stream, args.output, args.heuristic, args.solver, args.workers,
+                  args.time_limit, args.memory_limit, args.stats)
+
+if __name__ == "__main__":
+    main()
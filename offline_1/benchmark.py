@@ -0,0 +1,272 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import platform
+import random
+import time
+
+from heuristics import manhattan_distance, HEURISTICS, PatternDatabase
+from heuristics.pattern_database import DEFAULT_PARTITIONS
+from board import Board
+from packed_board import PackedBoard
+from solver import a_star_search, SEARCH_MODES
+from solvability import is_solvable, are_solvable
+from utils import inversion_count, inversion_count_quadratic
+from batch import solve_instance
+
+# boards:     the list-of-lists Board against PackedBoard on the same 15-puzzle instances
+# inversions: Fenwick vs quadratic inversion counting, and the batched NumPy solvability check
+# suite:      seeded instances x heuristics x solver modes, written as CSV and JSON reports
+# compare:    diff two suite JSON reports and list throughput and optimality regressions
+
+def random_walk_grid(k, steps, rng):
+    flat = list(range(1, k*k)) + [0]
+    blank = k*k - 1
+    previous = None
+    for _ in range(steps):
+        i, j = divmod(blank, k)
+        options = []
+        for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
+            x, y = i+dx, j+dy
+            if 0 <= x < k and 0 <= y < k and x*k + y != previous:
+                options.append(x*k + y)
+        target = rng.choice(options)
+        flat[blank], flat[target] = flat[target], flat[blank]
+        previous, blank = blank, target
+    return [flat[i*k:(i+1)*k] for i in range(k)]
+
+def time_solve(initial_state, heuristic):
+    start = time.perf_counter()
+    path, cost, explored, expanded = a_star_search(initial_state=initial_state,
+                                                   heuristic_func=heuristic)
+    return time.perf_counter() - start, cost, expanded
+
+# Seeded, solvable instances: 'walk' scrambles the goal with `steps` random moves (never
+# undoing the last one), 'uniform' shuffles all tiles and keeps only solvable permutations.
+# The generator is seeded from (seed, k, kind), so adding sizes or kinds leaves the
+# other instances unchanged.
+def generate_instances(k, kind, count, seed, steps):
+    rng = random.Random(f"{seed}-{k}-{kind}")
+    instances = []
+    while len(instances) < count:
+        if kind == 'walk':
+            grid = random_walk_grid(k, steps, rng)
+        else:
+            flat = list(range(k*k))
+            rng.shuffle(flat)
+            grid = [flat[i*k:(i+1)*k] for i in range(k)]
+            if not is_solvable(PackedBoard.from_grid(grid)):
+                continue
+        instances.append((f"k{k}-{kind}-{len(instances)}", grid))
+    return instances
+
+# Modes whose result is a proven optimum; with admissible heuristics their lowest cost
+# is the reference the other runs are measured against
+EXACT_MODES = ('astar', 'ida', 'ara', 'bidirectional')
+
+SUITE_FIELDS = ['id', 'k', 'kind', 'heuristic', 'solver', 'status', 'cost', 'optimal_cost',
+                'optimal', 'cost_ratio', 'explored', 'expanded', 'wall_time',
+                'nodes_per_second', 'peak_memory_kb']
+
+def run_suite(sizes, kinds, count, seed, steps, heuristics, solvers, workers=1,
+              time_limit=None, memory_limit_mb=None):
+    instances = {}
+    tasks = []
+    for k in sizes:
+        for kind in kinds:
+            for puzzle_id, grid in generate_instances(k, kind, count, seed, steps):
+                instances[puzzle_id] = (k, kind, grid)
+                for heuristic_name in heuristics:
+                    if heuristic_name == 'pdb':
+                        if k not in DEFAULT_PARTITIONS:
+                            continue
+                        # build missing tables once here rather than in every worker
+                        PatternDatabase(k)
+                    for solver_name in solvers:
+                        tasks.append((puzzle_id, grid, heuristic_name, solver_name,
+                                      time_limit, memory_limit_mb, False))
+
+    # one instance per worker process so limits and peak memory are per run;
+    # a single worker (the default) keeps the timings free of contention
+    with multiprocessing.Pool(processes=workers, maxtasksperchild=1) as pool:
+        records = pool.map(solve_instance, tasks, chunksize=1)
+
+    optimal = {}
+    for record in records:
+        if record['status'] == 'solved' and record['solver'] in EXACT_MODES:
+            best = optimal.get(record['id'])
+            optimal[record['id']] = record['cost'] if best is None else min(best, record['cost'])
+
+    rows = []
+    for record in records:
+        k, kind, _ = instances[record['id']]
+        row = dict.fromkeys(SUITE_FIELDS)
+        row.update({key: record.get(key) for key in SUITE_FIELDS if key in record})
+        row['kind'] = kind
+        row['optimal_cost'] = optimal.get(record['id'])
+        if record['status'] == 'solved':
+            if row['optimal_cost'] is not None:
+                row['optimal'] = record['cost'] == row['optimal_cost']
+                row['cost_ratio'] = round(record['cost'] / max(row['optimal_cost'], 1), 4)
+            if record['wall_time']:
+                row['nodes_per_second'] = round(record['expanded'] / record['wall_time'], 1)
+        rows.append(row)
+    rows.sort(key=lambda row: (row['k'], row['kind'], row['id'], row['heuristic'], row['solver']))
+    config = {'sizes': sizes, 'kinds': kinds, 'count': count, 'seed': seed, 'steps': steps,
+              'heuristics': heuristics, 'solvers': solvers, 'time_limit': time_limit,
+              'memory_limit_mb': memory_limit_mb, 'python': platform.python_version(),
+              'instances': {puzzle_id: grid for puzzle_id, (_, _, grid) in sorted(instances.items())}}
+    return config, rows
+
+def write_reports(directory, config, rows):
+    os.makedirs(directory, exist_ok=True)
+    csv_path = os.path.join(directory, 'suite.csv')
+    json_path = os.path.join(directory, 'suite.json')
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUITE_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(json_path, 'w') as f:
+        json.dump({'config': config, 'results': rows}, f, indent=1)
+        f.write('\n')
+    return csv_path, json_path
+
+def summarize(rows):
+    groups = {}
+    for row in rows:
+        groups.setdefault((row['k'], row['heuristic'], row['solver']), []).append(row)
+    print(f"{'k':>2} {'heuristic':>15} {'solver':>13} {'solved':>7} {'optimal':>8} "
+          f"{'expanded':>10} {'nodes/s':>9} {'peak MB':>8}")
+    for (k, heuristic, solver), group in sorted(groups.items()):
+        solved = [row for row in group if row['status'] == 'solved']
+        optimal = sum(1 for row in solved if row['optimal'])
+        expanded = sum(row['expanded'] for row in solved)
+        wall = sum(row['wall_time'] for row in solved)
+        memory = max((row['peak_memory_kb'] or 0 for row in group), default=0) / 1024
+        print(f"{k:>2} {heuristic:>15} {solver:>13} {len(solved):>3}/{len(group):<3} {optimal:>8} "
+              f"{expanded:>10} {expanded / wall if wall else 0:>9.0f} {memory:>8.1f}")
+
+# Matches runs by (id, heuristic, solver). A run regresses when it stops being solved
+# or optimal, expands more nodes (the searches are deterministic, so any change is
+# real) or loses more than `threshold` of its throughput. Throughput is only compared for
+# runs that took at least `min_time` seconds both times; shorter ones are mostly noise.
+def compare_reports(old_path, new_path, threshold, min_time):
+    with open(old_path) as f:
+        old = {(r['id'], r['heuristic'], r['solver']): r for r in json.load(f)['results']}
+    with open(new_path) as f:
+        new = {(r['id'], r['heuristic'], r['solver']): r for r in json.load(f)['results']}
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        problems = []
+        if before['status'] == 'solved' and after['status'] != 'solved':
+            problems.append(f"status {after['status']}")
+        elif before['status'] == after['status'] == 'solved':
+            if before['optimal'] and after['optimal'] is False:
+                problems.append(f"cost {before['cost']} -> {after['cost']}")
+            if after['expanded'] != before['expanded']:
+                problems.append(f"expanded {before['expanded']} -> {after['expanded']}")
+            if (min(before['wall_time'], after['wall_time']) >= min_time
+                    and after['nodes_per_second'] < before['nodes_per_second'] * (1 - threshold)):
+                problems.append(f"nodes/s {before['nodes_per_second']:.0f} -> {after['nodes_per_second']:.0f}")
+        if problems:
+            regressions += 1
+            print(f"{' / '.join(key)}: {', '.join(problems)}")
+    unmatched = len(old.keys() ^ new.keys())
+    if unmatched:
+        print(f"{unmatched} runs appear in only one report")
+    print(f"{regressions} of {len(old.keys() & new.keys())} matched runs regressed")
+    return regressions
+
+def bench_boards(instances, steps):
+    k = 4
+    rng = random.Random(318)
+    grids = [random_walk_grid(k, steps, rng) for _ in range(instances)]
+
+    totals = {'Board': 0.0, 'PackedBoard': 0.0}
+    print(f"{'#':>3} {'cost':>5} {'expanded':>9} {'Board (s)':>10} {'Packed (s)':>11}")
+    for idx, grid in enumerate(grids):
+        list_time, cost, expanded = time_solve(Board([row.copy() for row in grid]), manhattan_distance)
+        packed_time, packed_cost, _ = time_solve(PackedBoard.from_grid(grid), manhattan_distance)
+        assert cost == packed_cost
+        totals['Board'] += list_time
+        totals['PackedBoard'] += packed_time
+        print(f"{idx:>3} {cost:>5} {expanded:>9} {list_time:>10.3f} {packed_time:>11.3f}")
+
+    print(f"Total: Board {totals['Board']:.3f}s, PackedBoard {totals['PackedBoard']:.3f}s, "
+          f"speedup {totals['Board'] / max(totals['PackedBoard'], 1e-9):.2f}x")
+
+def bench_inversions(count, sizes):
+    rng = random.Random(318)
+    print(f"{'k':>3} {'quadratic (ms)':>15} {'fenwick (ms)':>13} {'batched (ms)':>13}")
+    for k in sizes:
+        grids = []
+        for _ in range(count):
+            flat = list(range(k*k))
+            rng.shuffle(flat)
+            grids.append([flat[i*k:(i+1)*k] for i in range(k)])
+        boards = [PackedBoard.from_grid(grid) if k <= 16 else Board(grid) for grid in grids]
+
+        start = time.perf_counter()
+        slow = [inversion_count_quadratic(board) for board in boards]
+        quadratic_time = time.perf_counter() - start
+        start = time.perf_counter()
+        fast = [inversion_count(board) for board in boards]
+        fenwick_time = time.perf_counter() - start
+        assert slow == fast
+
+        expected = [is_solvable(board) for board in boards]
+        start = time.perf_counter()
+        batched = are_solvable(grids)
+        batched_time = time.perf_counter() - start
+        assert list(batched) == expected
+        print(f"{k:>3} {quadratic_time*1000/count:>15.3f} {fenwick_time*1000/count:>13.3f} "
+              f"{batched_time*1000/count:>13.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="offline_1 micro-benchmarks")
+    sub = parser.add_subparsers(dest='bench', required=True)
+    boards = sub.add_parser('boards')
+    boards.add_argument('instances', type=int, nargs='?', default=5)
+    boards.add_argument('steps', type=int, nargs='?', default=40)
+    inversions = sub.add_parser('inversions')
+    inversions.add_argument('--count', type=int, default=200, help="boards per size")
+    inversions.add_argument('--sizes', type=int, nargs='+', default=[4, 10, 20, 30])
+    suite = sub.add_parser('suite', help="seeded instances x heuristics x solvers, CSV + JSON reports")
+    suite.add_argument('--output', default='bench_results', help="directory for suite.csv and suite.json")
+    suite.add_argument('--sizes', type=int, nargs='+', default=[3, 4, 5])
+    suite.add_argument('--kinds', nargs='+', choices=['walk', 'uniform'], default=['walk', 'uniform'])
+    suite.add_argument('--count', type=int, default=3, help="instances per size and kind")
+    suite.add_argument('--seed', type=int, default=318)
+    suite.add_argument('--steps', type=int, default=40, help="random-walk length")
+    suite.add_argument('--heuristics', nargs='+', choices=list(HEURISTICS) + ['pdb'], default=list(HEURISTICS),
+                       help="pdb builds its tables on first use: seconds for k=3, but 10-15 minutes "
+                            "per 6-tile table for k=4 (prebuild with heuristics/pattern_database.py)")
+    suite.add_argument('--solvers', nargs='+', choices=list(SEARCH_MODES), default=list(SEARCH_MODES))
+    suite.add_argument('--workers', type=int, default=1)
+    suite.add_argument('--time-limit', type=float, default=10, help="seconds per run")
+    suite.add_argument('--memory-limit', type=int, default=2048, help="MB of address space per run")
+    compare = sub.add_parser('compare', help="list regressions between two suite.json reports")
+    compare.add_argument('old')
+    compare.add_argument('new')
+    compare.add_argument('--threshold', type=float, default=0.2, help="tolerated throughput drop")
+    compare.add_argument('--min-time', type=float, default=0.5, help="shortest run whose throughput is compared")
+    args = parser.parse_args()
+    if args.bench == 'boards':
+        bench_boards(args.instances, args.steps)
+    elif args.bench == 'inversions':
+        bench_inversions(args.count, args.sizes)
+    elif args.bench == 'suite':
+        config, rows = run_suite(args.sizes, args.kinds, args.count, args.seed, args.steps,
+                                 args.heuristics, args.solvers, args.workers,
+                                 args.time_limit, args.memory_limit)
+        summarize(rows)
+        for path in write_reports(args.output, config, rows):
+            print(f"Wrote {path}")
+    else:
+        raise SystemExit(1 if compare_reports(args.old, args.new, args.threshold, args.min_time) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,13 @@ class Board():
         self.parent = parent
         self.g_n = 0 if parent is None else parent.g_n +1
         self.h_n = 0
+        self.move = None
         self.grid_size = len(grid)
         self.blank = self._find_blank_()
+    
+    @classmethod
+    def from_grid(cls, grid):
+        return cls(grid)
         
     def _find_blank_(self):
         for i in range(self.grid_size):
@@ -20,6 +25,16 @@ class Board():
     def __eq__(self,other):
         return self.grid == other.grid
     
+    def tiles(self):
+        return [val for row in self.grid for val in row]
+    
+    def key(self):
+        # exact, hashable state identity for search bookkeeping
+        return tuple(val for row in self.grid for val in row)
+    
+    def tile_at(self, index):
+        return self.grid[index // self.grid_size][index % self.grid_size]
+    
     def is_puzzle_solved(self):
         expected_val = 1
         for i in range(self.grid_size):
@@ -42,7 +57,10 @@ class Board():
             if 0 <= x < self.grid_size and 0 <= y < self.grid_size:
                 new_grid = [row.copy() for row in self.grid]
                 new_grid[i][j], new_grid[x][y] = new_grid[x][y], new_grid[i][j]
-                neighbors.append(Board(new_grid, self))       
+                neighbor = Board(new_grid, self)
+                # (tile, from, to) as flat indices, for incremental heuristics
+                neighbor.move = (new_grid[i][j], x*self.grid_size + y, i*self.grid_size + j)
+                neighbors.append(neighbor)       
         return neighbors                  
     
     # def __str__(self):
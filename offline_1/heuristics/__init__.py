@@ -2,4 +2,14 @@
 from .hamming import hamming_distance
 from .manhattan import manhattan_distance
 from .euclidean import euclidean_distance
-from .linear_conflict import linear_conflict_
\ No newline at end of file
+from .linear_conflict import linear_conflict_
+from .pattern_database import PatternDatabase
+
+# Name -> heuristic, for command-line selection. PatternDatabase needs a grid size,
+# so it is built on demand as 'pdb'.
+HEURISTICS = {
+    'hamming': hamming_distance,
+    'manhattan': manhattan_distance,
+    'euclidean': euclidean_distance,
+    'linear_conflict': linear_conflict_,
+}
@@ -1,15 +1,29 @@
 from math import sqrt
 
+# Each tile's distance is rounded to a whole number of nanounits before summing, so the
+# total is an exact integer multiple of 1/_SCALE: the incremental update below gives the
+# same float as a full recompute however long the path, and the goal is exactly 0.
+_SCALE = 10**9
+
+def _tile_euclidean(tile, index, k):
+    row, col = divmod(index, k)
+    expected_row, expected_col = divmod(tile-1, k)
+    return round(sqrt((row-expected_row)**2 + (col-expected_col)**2) * _SCALE)
+
 # Euclidean distance heuristic
 def euclidean_distance(board):
-    total = 0.0
-    for i in range(board.grid_size):
-        for j in range(board.grid_size):
-            val = board.grid[i][j]
-            if val == 0:
-                continue
-            expected_row = (val-1) // board.grid_size
-            expected_col = (val-1) % board.grid_size
-            dx, dy = i-expected_row, j-expected_col
-            total += sqrt(dx**2 + dy**2)
-    return total 
\ No newline at end of file
+    total = 0
+    k = board.grid_size
+    for idx, val in enumerate(board.tiles()):
+        if val == 0:
+            continue
+        total += _tile_euclidean(val, idx, k)
+    return total / _SCALE
+
+# O(1) update when a single tile moves: move is (tile, from, to) as flat indices
+def euclidean_incremental(board, parent_h, move):
+    tile, src, dst = move
+    k = board.grid_size
+    return (round(parent_h * _SCALE) + _tile_euclidean(tile, dst, k) - _tile_euclidean(tile, src, k)) / _SCALE
+
+euclidean_distance.incremental = euclidean_incremental
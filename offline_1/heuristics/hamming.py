@@ -1,9 +1,14 @@
 # Hamming distance heuristic
 def hamming_distance(board):
     count = 0
-    for i in range(board.grid_size):
-        for j in range(board.grid_size):
-            val = board.grid[i][j]
-            if val != 0 and val != i * board.grid_size + j + 1:
-                count += 1
-    return count            
\ No newline at end of file
+    for idx, val in enumerate(board.tiles()):
+        if val != 0 and val != idx + 1:
+            count += 1
+    return count            
+
+# O(1) update when a single tile moves: move is (tile, from, to) as flat indices
+def hamming_incremental(board, parent_h, move):
+    tile, src, dst = move
+    return parent_h + (dst != tile - 1) - (src != tile - 1)
+
+hamming_distance.incremental = hamming_incremental
\ No newline at end of file
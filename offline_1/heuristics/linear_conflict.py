@@ -1,15 +1,16 @@
-from .manhattan import manhattan_distance
+from .manhattan import manhattan_distance, tile_distance
 
 # Manhattan + linear conflict heuristic
 def linear_conflict_(board):
     manhattan = manhattan_distance(board)
     conflicts = 0
     k = board.grid_size
+    flat = board.tiles()
     # row-wise check
     for row in range(k):
         tiles = []
         for col in range(k):
-            val = board.grid[row][col]
+            val = flat[row*k + col]
             if val!=0 and (val-1) // k == row:
                 tiles.append(val)
         
@@ -21,7 +22,7 @@ def linear_conflict_(board):
     for col in range(k):
         tiles = []
         for row in range(k):
-            val = board.grid[row][col]
+            val = flat[row*k + col]
             if val!=0 and (val-1) % k == col:
                 tiles.append(val)
         
@@ -31,4 +32,42 @@ def linear_conflict_(board):
                     conflicts += 1
     # print(f"Linear Conflict: {manhattan+2*conflicts}")                
     return manhattan + 2*conflicts                        
-                        
\ No newline at end of file
+                        
+
+# Conflicts between `tile` standing at `index` and the other tiles of that row (or column)
+# that also belong to it. Reads only that line's k cells through tile_at.
+def _tile_conflicts(board, k, tile, index, along_row):
+    row, col = divmod(index, k)
+    conflicts = 0
+    if along_row:
+        if (tile-1) // k != row:
+            return 0
+        for c in range(k):
+            val = board.tile_at(row*k + c)
+            if c == col or val == 0 or val == tile or (val-1) // k != row:
+                continue
+            if (c < col and val > tile) or (c > col and val < tile):
+                conflicts += 1
+    else:
+        if (tile-1) % k != col:
+            return 0
+        for r in range(k):
+            val = board.tile_at(r*k + col)
+            if r == row or val == 0 or val == tile or (val-1) % k != col:
+                continue
+            if (r < row and val > tile) or (r > row and val < tile):
+                conflicts += 1
+    return conflicts
+
+# O(k) update when a single tile moves: move is (tile, from, to) as flat indices.
+# A vertical move only reorders the two rows involved, a horizontal one the two columns;
+# the blank does not take part in conflicts, so every other line is unchanged.
+def linear_conflict_incremental(board, parent_h, move):
+    tile, src, dst = move
+    k = board.grid_size
+    along_row = src // k != dst // k
+    delta = tile_distance(tile, dst, k) - tile_distance(tile, src, k)
+    delta += 2 * (_tile_conflicts(board, k, tile, dst, along_row) - _tile_conflicts(board, k, tile, src, along_row))
+    return parent_h + delta
+
+linear_conflict_.incremental = linear_conflict_incremental
\ No newline at end of file
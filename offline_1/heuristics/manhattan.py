@@ -1,13 +1,25 @@
 # Manhattan distance heuristic
 def manhattan_distance(board):
     sum = 0
-    for i in range(board.grid_size):
-        for j in range(board.grid_size):
-            val = board.grid[i][j]
-            if val == 0:
-                continue
-            expected_row = (val-1) // board.grid_size
-            expected_col = (val-1) % board.grid_size
-            sum += abs(i - expected_row) + abs(j - expected_col)
+    k = board.grid_size
+    for idx, val in enumerate(board.tiles()):
+        if val == 0:
+            continue
+        i, j = divmod(idx, k)
+        expected_row, expected_col = divmod(val-1, k)
+        sum += abs(i - expected_row) + abs(j - expected_col)
     # print(f"Man Distance: {sum}" )        
-    return sum        
\ No newline at end of file
+    return sum        
+
+def tile_distance(tile, index, k):
+    row, col = divmod(index, k)
+    expected_row, expected_col = divmod(tile-1, k)
+    return abs(row - expected_row) + abs(col - expected_col)
+
+# O(1) update when a single tile moves: move is (tile, from, to) as flat indices
+def manhattan_incremental(board, parent_h, move):
+    tile, src, dst = move
+    k = board.grid_size
+    return parent_h + tile_distance(tile, dst, k) - tile_distance(tile, src, k)
+
+manhattan_distance.incremental = manhattan_incremental
\ No newline at end of file
@@ -0,0 +1,218 @@
+import math
+import mmap
+import os
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Disjoint additive pattern databases.
+# Each pattern is a group of tiles; its table maps the cells those tiles occupy to the
+# number of moves of pattern tiles needed to bring them home (moves of other tiles are
+# free), so the tables of disjoint patterns can be summed and stay admissible.
+
+# Tables are built on first use by a pure-Python BFS and cached in PDB_DIR. The 3x3 tables
+# take seconds and a 5-tile 4x4 table about a minute, but each 6-tile table of the default
+# 4x4 6-6-3 split takes 10-15 minutes on one core; prebuild them with
+# `python heuristics/pattern_database.py 4`, or pass 5-5-5 partitions to trade some
+# heuristic strength for a much cheaper build.
+DEFAULT_PARTITIONS = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)],
+}
+
+PDB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pdb')
+
+UNSEEN = 255
+
+def _rank_weights(n, m):
+    return [math.perm(n-1-i, m-1-i) for i in range(m)]
+
+# Lexicographic rank of an ordered placement of m tiles on n cells, in [0, n!/(n-m)!)
+def _rank(positions, weights):
+    r = 0
+    for i, p in enumerate(positions):
+        smaller = 0
+        for j in range(i):
+            if positions[j] < p:
+                smaller += 1
+        r += (p - smaller) * weights[i]
+    return r
+
+def _unrank(r, n, weights):
+    free = list(range(n))
+    positions = []
+    for w in weights:
+        c, r = divmod(r, w)
+        positions.append(free.pop(c))
+    return positions
+
+def _path(directory, k, pattern):
+    return os.path.join(directory, f"k{k}_{'-'.join(map(str, pattern))}.npy")
+
+# Retrograde breadth-first search from the goal over (pattern cells, blank region) states.
+# Only pattern-tile moves cost anything, so the blank is tracked by the region of free
+# cells it can reach (keyed by the region's lowest cell) rather than its exact cell.
+def build_pattern_database(k, pattern):
+    n = k * k
+    m = len(pattern)
+    weights = _rank_weights(n, m)
+    size = math.perm(n, m)
+    table = bytearray([UNSEEN]) * size
+    # one bit per blank-region representative cell, in the smallest unsigned type with n bits;
+    # sized by entry count so the length does not depend on the platform's item sizes
+    typecode = next((tc for tc in 'HILQ' if array(tc).itemsize * 8 >= n), None)
+    if typecode is None:
+        raise ValueError(f"pattern databases support boards of at most 64 cells, not {n}")
+    seen = array(typecode, [0]) * size
+
+    full = (1 << n) - 1
+    not_first_col = full & ~sum(1 << (r*k) for r in range(k))
+    not_last_col = full & ~sum(1 << (r*k + k-1) for r in range(k))
+    neighbors = []
+    for idx in range(n):
+        i, j = divmod(idx, k)
+        neighbors.append([x*k + y for x, y in [(i-1,j), (i+1,j), (i,j-1), (i,j+1)] if 0 <= x < k and 0 <= y < k])
+
+    def region_of(cell, occupied):
+        free = full & ~occupied
+        region = 1 << cell
+        while True:
+            grown = (region | ((region << 1) & not_first_col) | ((region >> 1) & not_last_col)
+                     | (region << k) | (region >> k)) & free
+            if grown == region:
+                return region
+            region = grown
+
+    goal = [tile - 1 for tile in pattern]
+    occupied = sum(1 << p for p in goal)
+    region = region_of(n - 1, occupied)
+    rep = (region & -region).bit_length() - 1
+    start = _rank(goal, weights)
+    table[start] = 0
+    seen[start] |= 1 << rep
+    frontier = array('Q', [start * n + rep])
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = array('Q')
+        for code in frontier:
+            r, rep = divmod(code, n)
+            positions = _unrank(r, n, weights)
+            occupied = 0
+            for p in positions:
+                occupied |= 1 << p
+            region = region_of(rep, occupied)
+            for i, p in enumerate(positions):
+                for q in neighbors[p]:
+                    if not (region >> q) & 1:
+                        continue
+                    positions[i] = q
+                    new_region = region_of(p, occupied ^ (1 << p) ^ (1 << q))
+                    new_rep = (new_region & -new_region).bit_length() - 1
+                    nr = _rank(positions, weights)
+                    positions[i] = p
+                    if (seen[nr] >> new_rep) & 1:
+                        continue
+                    seen[nr] |= 1 << new_rep
+                    if table[nr] == UNSEEN:
+                        table[nr] = depth
+                    next_frontier.append(nr * n + new_rep)
+        frontier = next_frontier
+    return table
+
+def save_pattern_database(path, table):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if np is not None:
+        np.save(path, np.frombuffer(bytes(table), dtype=np.uint8))
+        return
+    # plain .npy (format 1.0) so the file is the same with or without numpy
+    header = f"{{'descr': '|u1', 'fortran_order': False, 'shape': ({len(table)},), }}"
+    header += ' ' * (63 - (10 + len(header)) % 64) + '\n'
+    with open(path, 'wb') as f:
+        f.write(b'\x93NUMPY\x01\x00' + len(header).to_bytes(2, 'little') + header.encode('latin1'))
+        f.write(table)
+
+# Memory-maps a saved table; the result indexes to plain ints either way
+def load_pattern_database(path):
+    if np is not None:
+        return memoryview(np.load(path, mmap_mode='r'))
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    offset = 10 + int.from_bytes(mapped[8:10], 'little')
+    return memoryview(mapped)[offset:]
+
+
+# A heuristic value that also carries the cells of each partition's tiles, so a child's
+# value can be derived from its parent's h alone. Every solver threads the parent's h into
+# incremental(), including IDA*, which moves tiles in place on a single board.
+class PatternValue(int):
+    pass
+
+
+class PatternDatabase():
+    def __init__(self, k, partitions=None, directory=PDB_DIR):
+        self.__name__ = 'pattern_database'
+        self.grid_size = k
+        if partitions is None:
+            if k not in DEFAULT_PARTITIONS:
+                sizes = ', '.join(map(str, sorted(DEFAULT_PARTITIONS)))
+                raise ValueError(f"no default pattern-database partitions for k={k} (defaults exist for "
+                                 f"k = {sizes}); pass partitions= with disjoint groups of tiles")
+            partitions = DEFAULT_PARTITIONS[k]
+        self.partitions = [tuple(p) for p in partitions]
+        self.weights = [_rank_weights(k * k, len(p)) for p in self.partitions]
+        self.tables = []
+        for pattern in self.partitions:
+            path = _path(directory, k, pattern)
+            if not os.path.exists(path):
+                save_pattern_database(path, build_pattern_database(k, pattern))
+            self.tables.append(load_pattern_database(path))
+        self.partition_of = {}
+        self.slot_of = {}
+        for idx, pattern in enumerate(self.partitions):
+            for slot, tile in enumerate(pattern):
+                self.partition_of[tile] = idx
+                self.slot_of[tile] = slot
+
+    def __call__(self, board):
+        position = [0] * (board.grid_size * board.grid_size)
+        for idx, val in enumerate(board.tiles()):
+            position[val] = idx
+        total = 0
+        cells = []
+        for pattern, weights, table in zip(self.partitions, self.weights, self.tables):
+            pattern_cells = tuple(position[tile] for tile in pattern)
+            total += table[_rank(pattern_cells, weights)]
+            cells.append(pattern_cells)
+        value = PatternValue(total)
+        value.cells = tuple(cells)
+        return value
+
+    # Only the moved tile's partition changes: its cells come from the parent's value with
+    # the moved tile's entry replaced, then that partition is looked up before and after
+    def incremental(self, board, parent_h, move):
+        tile, src, dst = move
+        idx = self.partition_of.get(tile)
+        if idx is None:
+            return parent_h
+        parent_cells = getattr(parent_h, 'cells', None)
+        if parent_cells is None:
+            return self(board)
+        pattern, weights, table = self.partitions[idx], self.weights[idx], self.tables[idx]
+        before_cells = parent_cells[idx]
+        slot = self.slot_of[tile]
+        after_cells = before_cells[:slot] + (dst,) + before_cells[slot+1:]
+        value = PatternValue(parent_h + table[_rank(after_cells, weights)] - table[_rank(before_cells, weights)])
+        value.cells = parent_cells[:idx] + (after_cells,) + parent_cells[idx+1:]
+        return value
+
+
+if __name__ == "__main__":
+    # Prebuild the default tables: python heuristics/pattern_database.py 4
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    PatternDatabase(k)
+    print(f"Pattern databases for k={k} ready in {PDB_DIR}")
@@ -1,13 +1,33 @@
+import argparse
+
 from heuristics import manhattan_distance, hamming_distance, euclidean_distance, linear_conflict_
 from board import Board
-from solver import a_star_search
+from packed_board import board_from_grid
+from solver import SEARCH_MODES
+from stats import SearchStats
 from utils import print_board
 from solvability import is_solvable
 
 def main():
+    parser = argparse.ArgumentParser(description="Solve an n-puzzle read from stdin")
+    parser.add_argument('--solver', choices=SEARCH_MODES, default='astar',
+                        help="astar (default), ida for bounded-memory iterative deepening, "
+                             "weighted/ara/bidirectional for faster solves")
+    parser.add_argument('--weight', type=float, default=None,
+                        help="heuristic weight for weighted and ara (solution within this factor of optimal)")
+    parser.add_argument('--deadline', type=float, default=None,
+                        help="seconds ara may spend improving its solution")
+    parser.add_argument('--stats', metavar='FILE', default=None,
+                        help="write search timings, peak list sizes and f histograms to FILE as JSON")
+    args = parser.parse_args()
+    if args.weight is not None and args.solver not in ('weighted', 'ara'):
+        parser.error(f"--weight applies to --solver weighted or ara, not {args.solver}")
+    if args.deadline is not None and args.solver != 'ara':
+        parser.error(f"--deadline applies to --solver ara, not {args.solver}")
+    
     k = int(input())
     grid = [list(map(int, input().split())) for _ in range(k)]
-    initial_node = Board(grid)
+    initial_node = board_from_grid(grid)
     
     # Solvability check
     if not is_solvable(initial_node):
@@ -16,16 +36,31 @@ def main():
     
     heuristic = hamming_distance
     
-    path, cost, explored, expanded = a_star_search(initial_state=initial_node, 
-                                                   heuristic_func=heuristic)
+    options = {}
+    if args.weight is not None:
+        options['weight'] = args.weight
+    if args.deadline is not None:
+        options['deadline'] = args.deadline
+    if args.stats is not None:
+        options['stats'] = SearchStats()
+    counters = {}
+    search = SEARCH_MODES[args.solver]
+    path, cost, explored, expanded = search(initial_state=initial_node, 
+                                            heuristic_func=heuristic,
+                                            counters=counters, **options)
     
-    print(f"Minimum number of moves: {cost}")
+    if counters.get('bound', 1) > 1:
+        print(f"Number of moves: {cost} (at most {counters['bound']:.3g}x the minimum)")
+    else:
+        print(f"Minimum number of moves: {cost}")
     
     for config in path:
         print_board(config)
         
     print(f"Nodes explored: {explored}")
-    print(f"Nodes expanded: {expanded}")    
+    print(f"Nodes expanded: {expanded}")
+    if args.stats is not None:
+        options['stats'].to_json(args.stats, indent=2)    
     
 if __name__ == "__main__":
     main()
\ No newline at end of file
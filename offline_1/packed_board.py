@@ -0,0 +1,103 @@
+# Compact board: the whole permutation is packed into one integer,
+# one byte per cell (row-major, little-endian), with the blank kept as a flat index.
+# Moves and hashing are O(1); .grid is only built when someone asks for it.
+
+from board import Board
+
+# A byte holds tiles up to 255, so only boards of at most 256 cells (k <= 16) can be packed
+MAX_CELLS = 256
+
+_tables = {}
+
+def _tables_for(k):
+    # goal state and blank move targets, shared per grid size
+    if k not in _tables:
+        n = k * k
+        goal = 0
+        for idx in range(n - 1):
+            goal |= (idx + 1) << (idx * 8)
+        moves = []
+        for idx in range(n):
+            i, j = divmod(idx, k)
+            targets = []
+            for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
+                x, y = i+dx, j+dy
+                if 0 <= x < k and 0 <= y < k:
+                    targets.append(x * k + y)
+            moves.append(tuple(targets))
+        _tables[k] = (goal, tuple(moves))
+    return _tables[k]
+
+
+class PackedBoard():
+    __slots__ = ('state', 'blank_index', 'grid_size', 'parent', 'g_n', 'h_n', 'move')
+
+    def __init__(self, state, blank_index, grid_size, parent=None):
+        self.state = state
+        self.blank_index = blank_index
+        self.grid_size = grid_size
+        self.parent = parent
+        self.g_n = 0 if parent is None else parent.g_n +1
+        self.h_n = 0
+        self.move = None
+
+    @classmethod
+    def from_grid(cls, grid):
+        flat = bytes(val for row in grid for val in row)
+        return cls(int.from_bytes(flat, 'little'), flat.index(0), len(grid))
+
+    @classmethod
+    def from_board(cls, board):
+        return cls.from_grid(board.grid)
+
+    def tile_at(self, index):
+        return (self.state >> (index * 8)) & 0xFF
+
+    def tiles(self):
+        # row-major tile values as a bytes object
+        return self.state.to_bytes(self.grid_size * self.grid_size, 'little')
+
+    @property
+    def grid(self):
+        k = self.grid_size
+        flat = self.tiles()
+        return [list(flat[i*k:(i+1)*k]) for i in range(k)]
+
+    @property
+    def blank(self):
+        return divmod(self.blank_index, self.grid_size)
+
+    def key(self):
+        # exact, hashable state identity for search bookkeeping
+        return self.state
+
+    def __hash__(self):
+        # hash(int) reduces modulo 2**61 - 1, which folds the byte fields onto each other
+        return hash(self.tiles())
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedBoard):
+            return NotImplemented
+        return self.grid_size == other.grid_size and self.state == other.state
+
+    def is_puzzle_solved(self):
+        return self.state == _tables_for(self.grid_size)[0]
+
+    def get_neighbor_nodes(self):
+        moves = _tables_for(self.grid_size)[1]
+        state, blank = self.state, self.blank_index
+        neighbors = []
+        for target in moves[blank]:
+            tile = (state >> (target * 8)) & 0xFF
+            # the blank byte is zero, so sliding a tile is one subtract and one add
+            new_state = state - (tile << (target * 8)) + (tile << (blank * 8))
+            neighbor = PackedBoard(new_state, target, self.grid_size, self)
+            neighbor.move = (tile, target, blank)
+            neighbors.append(neighbor)
+        return neighbors
+
+# PackedBoard where the tiles fit in a byte, the list-of-lists Board for larger boards
+def board_from_grid(grid):
+    if len(grid) * len(grid) > MAX_CELLS:
+        return Board(grid)
+    return PackedBoard.from_grid(grid)
@@ -1,5 +1,10 @@
 from utils import inversion_count
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Functions to check if a board is solvable
 def is_solvable(board):
     k = board.grid_size
@@ -11,6 +16,37 @@ def is_solvable(board):
     else:
         blank_row = board.blank[0]
         blank_row_from_bottom = k - blank_row
-        return (blank_row_from_bottom % 2 == 0 and inversions % 2 == 1) or (blank_row_from_bottom % 2 == 1 and inversions % 2 == 0) 
-    
-    
\ No newline at end of file
+        return (blank_row_from_bottom % 2 == 0 and inversions % 2 == 1) or (blank_row_from_bottom % 2 == 1 and inversions % 2 == 0)
+
+# Vectorized check for a whole batch: `boards` is any array-like of shape (B, k, k) or
+# (B, k*k) holding row-major tiles with 0 for the blank. Returns a boolean array of length B.
+def are_solvable(boards, k=None):
+    if np is None:
+        raise ImportError("are_solvable needs numpy; use is_solvable per board instead")
+    tiles = np.asarray(boards)
+    if tiles.ndim == 3:
+        k = tiles.shape[1]
+    tiles = tiles.reshape(len(tiles), -1)
+    if k is None:
+        k = int(round(tiles.shape[1] ** 0.5))
+    count, n = tiles.shape
+    # Only the parity of the inversion count matters, and that is the parity of the number
+    # of swaps a selection sort needs: n-1 vectorized steps, each O(B), instead of O(n^2)
+    # comparisons per board.
+    perm = tiles[tiles != 0].reshape(count, n - 1) - 1
+    where = np.argsort(perm, axis=1)
+    rows = np.arange(count)
+    swaps = np.zeros(count, dtype=np.int64)
+    for i in range(n - 1):
+        j = where[:, i]
+        swaps += j != i
+        displaced = perm[:, i].copy()
+        perm[rows, j] = displaced
+        perm[:, i] = i
+        where[rows, displaced] = j
+        where[:, i] = i
+    inversions = swaps
+    if k % 2 == 1:
+        return inversions % 2 == 0
+    blank_row_from_bottom = k - np.argmax(tiles == 0, axis=1) // k
+    return (blank_row_from_bottom % 2 == 0) == (inversions % 2 == 1)
@@ -1,40 +1,393 @@
 import heapq
+import math
+import time
+
+from board import Board
 
 # A* search algorithm implementation
-def a_star_search(initial_state, heuristic_func):
+# best_g holds the cheapest known g per state key. A neighbor is pushed only when it
+# improves on that, and heap entries made stale by a later, cheaper push are dropped
+# when popped (lazy deletion), so there is no decrease-key and no duplicate expansion.
+# With weight > 1 this is weighted A* (f = g + w*h), whose solution costs at most w
+# times the optimum. If `counters` is a dict it receives reexpansions, stale_pops,
+# peak_open, closed and bound (the suboptimality factor the result is proven within).
+# `stats` takes a stats.SearchStats to time and profile the run.
+def a_star_search(initial_state, heuristic_func, counters=None, weight=1, stats=None):
     open_list = []
     counter = 0
+    heuristic_func, incremental, neighbors_of, push, pop = _hooks(
+        stats, 'astar' if weight == 1 else 'weighted', heuristic_func, type(initial_state))
     initial_state.h_n = heuristic_func(initial_state)
-    heapq.heappush(open_list, (initial_state.h_n, initial_state.h_n, counter, initial_state))
+    push(open_list, (weight * initial_state.h_n, initial_state.h_n, counter, initial_state))
+    best_g = {initial_state.key(): initial_state.g_n}
     closed_list = set()
     explored, expanded = 0,0
+    reexpansions, stale_pops, peak_open = 0, 0, 1
+    
+    def report():
+        if counters is not None:
+            counters.update(reexpansions=reexpansions, stale_pops=stale_pops,
+                            peak_open=peak_open, closed=len(closed_list), bound=weight)
+        if stats is not None:
+            stats.open_size(peak_open)
+            stats.closed_size(len(closed_list))
+            stats.finish(explored, expanded)
     
     while open_list:
-        _, _, _, current_node = heapq.heappop(open_list)
+        f_n, _, _, current_node = pop(open_list)
+        key = current_node.key()
+        if current_node.g_n > best_g[key]:
+            stale_pops += 1
+            continue
         
         if current_node.is_puzzle_solved():
+            report()
             path = []
             while current_node:
                 path.append(current_node)
                 current_node = current_node.parent
             return path[::-1], len(path)-1, explored, expanded    
         
-        # if hash(current_node) in closed_list:
-        #     continue
-        closed_list.add(hash(current_node))
+        # only an inconsistent heuristic can reopen a closed state with a smaller g
+        if key in closed_list:
+            reexpansions += 1
+        else:
+            closed_list.add(key)
         expanded += 1
+        if stats is not None:
+            stats.record(f_n)
         
-        neighbors = current_node.get_neighbor_nodes()
-        # expanded += len(neighbors)
-        
-        for neighbor in neighbors:
-            if hash(neighbor) in closed_list:
+        g_n = current_node.g_n + 1
+        for neighbor in neighbors_of(current_node):
+            neighbor_key = neighbor.key()
+            known_g = best_g.get(neighbor_key)
+            if known_g is not None and known_g <= g_n:
                 continue
-            neighbor.g_n = current_node.g_n + 1
-            neighbor.h_n = heuristic_func(neighbor)
-            f_n = neighbor.g_n + neighbor.h_n
-            # print(f_n)
+            best_g[neighbor_key] = g_n
+            neighbor.g_n = g_n
+            if incremental is not None and neighbor.move is not None:
+                neighbor.h_n = incremental(neighbor, current_node.h_n, neighbor.move)
+            else:
+                neighbor.h_n = heuristic_func(neighbor)
+            f_n = neighbor.g_n + weight * neighbor.h_n
             counter += 1
-            heapq.heappush(open_list,(f_n, neighbor.h_n,counter, neighbor))
+            push(open_list,(f_n, neighbor.h_n,counter, neighbor))
             explored += 1
-    return None, 0, 0, 0    
\ No newline at end of file
+        if len(open_list) > peak_open:
+            peak_open = len(open_list)
+    report()
+    return None, 0, 0, 0    
+
+# slack for rounding in fractional heuristic values when ida_star_search rounds f up to a bound
+_BOUND_TOLERANCE = 1e-6
+
+# Iterative-deepening A*: depth-first search under an f-bound that grows to the
+# smallest f that exceeded it. The tiles are moved in place on a single working
+# board and undone on the way back, so memory is O(depth) instead of O(nodes).
+# With `stats`, only heuristic time is measured: moves are made inline, there is no heap.
+def ida_star_search(initial_state, heuristic_func, counters=None, stats=None):
+    heuristic_func, incremental, _, _, _ = _hooks(stats, 'ida', heuristic_func, Board)
+    k = initial_state.grid_size
+    board = Board([row.copy() for row in initial_state.grid])
+    grid = board.grid
+    moves = []
+    for idx in range(k * k):
+        i, j = divmod(idx, k)
+        moves.append([x*k + y for x, y in [(i-1,j), (i+1,j), (i,j-1), (i,j+1)] if 0 <= x < k and 0 <= y < k])
+    goal_blank = k * k - 1
+    path_moves = []     # undo stack: where the blank went at each depth
+    counts = [0, 0]     # explored, expanded
+    found = -1
+
+    def search(blank, g, h, bound, previous):
+        f = g + h
+        if f > bound:
+            return f
+        # the goal test must not rely on h being exactly 0; only the goal's blank position is checked
+        if blank == goal_blank and board.is_puzzle_solved():
+            return found
+        counts[1] += 1
+        if stats is not None:
+            stats.record(f)
+        minimum = float('inf')
+        bi, bj = divmod(blank, k)
+        for target in moves[blank]:
+            if target == previous:
+                continue
+            ti, tj = divmod(target, k)
+            tile = grid[ti][tj]
+            grid[bi][bj], grid[ti][tj] = tile, 0
+            board.blank = (ti, tj)
+            if incremental is not None:
+                child_h = incremental(board, h, (tile, target, blank))
+            else:
+                child_h = heuristic_func(board)
+            counts[0] += 1
+            path_moves.append(target)
+            t = search(target, g + 1, child_h, bound, blank)
+            if t == found:
+                return found
+            path_moves.pop()
+            grid[bi][bj], grid[ti][tj] = 0, tile
+            board.blank = (bi, bj)
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    blank = board.blank[0] * k + board.blank[1]
+    h = heuristic_func(board)
+    # every move costs 1, so the optimum is a whole number and the bound only needs to grow
+    # in whole moves; with a fractional heuristic (euclidean) each distinct f below the
+    # optimum would otherwise cost an iteration
+    bound = math.ceil(h - _BOUND_TOLERANCE)
+    iterations = 0
+    while True:
+        iterations += 1
+        t = search(blank, 0, h, bound, None)
+        if t == found:
+            break
+        if t == float('inf'):
+            if stats is not None:
+                stats.finish(*counts)
+            return None, 0, 0, 0
+        bound = max(bound + 1, math.ceil(t - _BOUND_TOLERANCE))
+        if stats is not None:
+            stats.iteration()
+
+    if counters is not None:
+        counters.update(bound=1, iterations=iterations)
+    if stats is not None:
+        stats.finish(*counts)
+    initial_state.h_n = h
+    return _replay_path(initial_state, path_moves), len(path_moves), counts[0], counts[1]
+
+# Rebuilds a parent-linked path on the caller's board type from the blank's successive
+# flat indices
+def _replay_path(initial_state, blank_targets):
+    k = initial_state.grid_size
+    current = initial_state
+    path = [current]
+    for target in blank_targets:
+        target_pos = divmod(target, k)
+        current = next(n for n in current.get_neighbor_nodes() if n.blank == target_pos)
+        path.append(current)
+    return path
+
+def _blank_index(board):
+    return board.blank[0] * board.grid_size + board.blank[1]
+
+# The calls a SearchStats times. Without one these are the plain functions, so the hot
+# loops pay nothing for instrumentation that is switched off.
+def _hooks(stats, solver, heuristic_func, board_type):
+    # heuristics that can update h from the parent's value on a single tile move
+    incremental = getattr(heuristic_func, 'incremental', None)
+    neighbors_of = board_type.get_neighbor_nodes
+    push, pop = heapq.heappush, heapq.heappop
+    if stats is not None:
+        stats.begin(solver, heuristic_func)
+        heuristic_func = stats.timed(heuristic_func, 'heuristic')
+        if incremental is not None:
+            incremental = stats.timed(incremental, 'heuristic')
+        neighbors_of = stats.timed(neighbors_of, 'neighbors')
+        push = stats.timed(push, 'heap')
+        pop = stats.timed(pop, 'heap')
+    return heuristic_func, incremental, neighbors_of, push, pop
+
+def weighted_a_star_search(initial_state, heuristic_func, counters=None, weight=2, stats=None):
+    return a_star_search(initial_state, heuristic_func, counters, weight=weight, stats=stats)
+
+# Anytime repairing A* (Likhachev et al.): weighted A* with a falling weight that reuses
+# the previous search instead of starting over. States whose g improves after they were
+# expanded wait in an INCONS list and are only reopened when the weight drops. Returns
+# the best solution found when the weight reaches 1 or the deadline (seconds) passes;
+# the search for the first solution is never cut short.
+# counters['solutions'] lists every improvement as cost, epsilon, bound and elapsed
+# time; counters['bound'] is the suboptimality factor of the returned path.
+def ara_star_search(initial_state, heuristic_func, counters=None, weight=3, step=0.5, deadline=None,
+                    stats=None):
+    started = time.perf_counter()
+    heuristic_func, incremental, neighbors_of, push, pop = _hooks(
+        stats, 'ara', heuristic_func, type(initial_state))
+    initial_state.h_n = heuristic_func(initial_state)
+    start_key = initial_state.key()
+    best_g = {start_key: initial_state.g_n}
+    nodes = {start_key: initial_state}
+    open_keys = {start_key}
+    incons = set()
+    closed_list = set()
+    goal = initial_state if initial_state.is_puzzle_solved() else None
+    explored, expanded = 0, 0
+    solutions = []
+    epsilon = weight
+    bound = float('inf')
+
+    def timed_out():
+        return deadline is not None and time.perf_counter() - started > deadline
+
+    while True:
+        # rebuild the heap for the current epsilon from every open state
+        counter = 0
+        open_list = []
+        for key in open_keys:
+            node = nodes[key]
+            counter += 1
+            open_list.append((node.g_n + epsilon * node.h_n, node.h_n, counter, node))
+        heapq.heapify(open_list)
+        closed_list.clear()
+        if stats is not None and solutions:
+            stats.iteration()
+
+        # improve the path until the goal's g is within epsilon of every open f
+        while open_list and (goal is None or goal.g_n > open_list[0][0]):
+            # the deadline only cuts improvements short; the first solution is always finished
+            if goal is not None and timed_out():
+                break
+            f_n, _, _, current_node = pop(open_list)
+            key = current_node.key()
+            if current_node is not nodes[key] or key not in open_keys:
+                continue
+            open_keys.discard(key)
+            closed_list.add(key)
+            expanded += 1
+            if stats is not None:
+                stats.record(f_n)
+                stats.open_size(len(open_list))
+            g_n = current_node.g_n + 1
+            for neighbor in neighbors_of(current_node):
+                neighbor_key = neighbor.key()
+                known_g = best_g.get(neighbor_key)
+                if known_g is not None and known_g <= g_n:
+                    continue
+                best_g[neighbor_key] = g_n
+                nodes[neighbor_key] = neighbor
+                if incremental is not None and neighbor.move is not None:
+                    neighbor.h_n = incremental(neighbor, current_node.h_n, neighbor.move)
+                else:
+                    neighbor.h_n = heuristic_func(neighbor)
+                explored += 1
+                if neighbor.is_puzzle_solved():
+                    goal = neighbor
+                if neighbor_key in closed_list:
+                    incons.add(neighbor_key)
+                else:
+                    open_keys.add(neighbor_key)
+                    counter += 1
+                    push(open_list, (g_n + epsilon * neighbor.h_n, neighbor.h_n, counter, neighbor))
+        if stats is not None:
+            stats.closed_size(len(closed_list))
+
+        if goal is None:
+            break
+        # the proven bound: goal cost over the smallest g+h still waiting anywhere
+        pending = [nodes[key].g_n + nodes[key].h_n for key in open_keys | incons]
+        lower = min(pending) if pending else goal.g_n
+        bound = max(1, min(epsilon, goal.g_n / lower)) if lower > 0 else 1
+        if not solutions or solutions[-1]['cost'] > goal.g_n or solutions[-1]['bound'] > bound:
+            solutions.append({'cost': goal.g_n, 'epsilon': epsilon, 'bound': bound,
+                              'elapsed': time.perf_counter() - started, 'expanded': expanded})
+        if epsilon <= 1 or bound <= 1 or timed_out():
+            break
+        epsilon = max(1, epsilon - step)
+        open_keys |= incons
+        incons.clear()
+
+    if counters is not None:
+        counters.update(bound=bound, solutions=solutions, closed=len(closed_list))
+    if stats is not None:
+        stats.finish(explored, expanded)
+    if goal is None:
+        return None, 0, 0, 0
+    path = []
+    current_node = goal
+    while current_node:
+        path.append(current_node)
+        current_node = current_node.parent
+    return path[::-1], len(path)-1, explored, expanded
+
+# Bidirectional search that meets in the middle: A* forward from the start, uniform-cost
+# search backward from the goal. Each round expands the side with the smaller frontier.
+# The best meeting cost mu is optimal once it is no larger than either frontier's lowest
+# f (forward) or g (backward), so counters['bound'] is always 1.
+def bidirectional_search(initial_state, heuristic_func, counters=None, stats=None):
+    heuristic_func, incremental, neighbors_of, push, pop = _hooks(
+        stats, 'bidirectional', heuristic_func, type(initial_state))
+    k = initial_state.grid_size
+    goal_grid = [[(i*k + j + 1) % (k*k) for j in range(k)] for i in range(k)]
+    goal_state = type(initial_state).from_grid(goal_grid)
+
+    initial_state.h_n = heuristic_func(initial_state)
+    forward_open = [(initial_state.h_n, 0, initial_state)]
+    backward_open = [(0, 0, goal_state)]
+    forward = {initial_state.key(): initial_state}
+    backward = {goal_state.key(): goal_state}
+    counter = 0
+    explored, expanded = 0, 0
+    mu, meet = float('inf'), None
+    if initial_state.key() in backward:
+        mu, meet = 0, initial_state.key()
+
+    while forward_open and backward_open:
+        # drop entries made stale by a cheaper copy pushed later
+        while forward_open and forward_open[0][2] is not forward[forward_open[0][2].key()]:
+            pop(forward_open)
+        while backward_open and backward_open[0][2] is not backward[backward_open[0][2].key()]:
+            pop(backward_open)
+        if not forward_open or not backward_open:
+            break
+        if mu <= max(forward_open[0][0], backward_open[0][0]):
+            break
+
+        expand_forward = len(forward_open) <= len(backward_open)
+        frontier, seen, other = (forward_open, forward, backward) if expand_forward else (backward_open, backward, forward)
+        f_n, _, current_node = pop(frontier)
+        expanded += 1
+        if stats is not None:
+            stats.record(f_n)
+            stats.open_size(len(forward_open) + len(backward_open))
+        g_n = current_node.g_n + 1
+        for neighbor in neighbors_of(current_node):
+            neighbor_key = neighbor.key()
+            known = seen.get(neighbor_key)
+            if known is not None and known.g_n <= g_n:
+                continue
+            seen[neighbor_key] = neighbor
+            counter += 1
+            explored += 1
+            if expand_forward:
+                if incremental is not None and neighbor.move is not None:
+                    neighbor.h_n = incremental(neighbor, current_node.h_n, neighbor.move)
+                else:
+                    neighbor.h_n = heuristic_func(neighbor)
+                push(frontier, (g_n + neighbor.h_n, counter, neighbor))
+            else:
+                push(frontier, (g_n, counter, neighbor))
+            if neighbor_key in other and g_n + other[neighbor_key].g_n < mu:
+                mu, meet = g_n + other[neighbor_key].g_n, neighbor_key
+
+    if counters is not None:
+        counters.update(bound=1, closed=len(forward) + len(backward))
+    if stats is not None:
+        stats.closed_size(len(forward) + len(backward))
+        stats.finish(explored, expanded)
+    if meet is None:
+        return None, 0, 0, 0
+    # blank positions from the start to the meeting state, then on towards the goal
+    blanks = []
+    current_node = forward[meet]
+    while current_node.parent is not None:
+        blanks.append(_blank_index(current_node))
+        current_node = current_node.parent
+    blanks.reverse()
+    current_node = backward[meet].parent
+    while current_node is not None:
+        blanks.append(_blank_index(current_node))
+        current_node = current_node.parent
+    return _replay_path(initial_state, blanks), mu, explored, expanded
+
+SEARCH_MODES = {
+    'astar': a_star_search,
+    'ida': ida_star_search,
+    'weighted': weighted_a_star_search,
+    'ara': ara_star_search,
+    'bidirectional': bidirectional_search,
+}
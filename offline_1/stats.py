@@ -0,0 +1,95 @@
+import json
+import time
+from collections import Counter
+
+# Optional instrumentation for the searches in solver.py. Pass a SearchStats as
+# `stats=` and the solver swaps its heuristic, neighbor and heap calls for timed
+# wrappers; without it the plain functions are used, so a disabled run pays nothing
+# beyond one `is not None` test per expansion.
+#
+# f_histograms holds one Counter of expanded f-values per iteration: a single one for
+# A*, one per bound for IDA*, one per epsilon for ARA*.
+
+TIMERS = ('heuristic', 'neighbors', 'heap')
+
+
+class SearchStats():
+    def __init__(self, label=None):
+        self.label = label
+        self.solver = None
+        self.heuristic = None
+        self.times = dict.fromkeys(TIMERS, 0.0)
+        self.calls = dict.fromkeys(TIMERS, 0)
+        self.peak_open = 0
+        self.peak_closed = 0
+        self.explored = 0
+        self.expanded = 0
+        self.elapsed = 0.0
+        self.f_histograms = []
+        self._started = None
+
+    def begin(self, solver, heuristic_func):
+        self.solver = solver
+        self.heuristic = getattr(heuristic_func, '__name__', type(heuristic_func).__name__)
+        self._started = time.perf_counter()
+        self.iteration()
+
+    def iteration(self):
+        self.f_histograms.append(Counter())
+
+    def record(self, f):
+        self.f_histograms[-1][f] += 1
+
+    def open_size(self, size):
+        if size > self.peak_open:
+            self.peak_open = size
+
+    def closed_size(self, size):
+        if size > self.peak_closed:
+            self.peak_closed = size
+
+    def finish(self, explored, expanded):
+        self.elapsed = time.perf_counter() - self._started
+        self.explored = explored
+        self.expanded = expanded
+
+    def timed(self, func, timer):
+        times, calls = self.times, self.calls
+        clock = time.perf_counter
+
+        def wrapper(*args):
+            start = clock()
+            try:
+                return func(*args)
+            finally:
+                times[timer] += clock() - start
+                calls[timer] += 1
+        return wrapper
+
+    @property
+    def nodes_per_second(self):
+        return self.expanded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self):
+        return {
+            'label': self.label,
+            'solver': self.solver,
+            'heuristic': self.heuristic,
+            'elapsed': self.elapsed,
+            'explored': self.explored,
+            'expanded': self.expanded,
+            'nodes_per_second': self.nodes_per_second,
+            'peak_open': self.peak_open,
+            'peak_closed': self.peak_closed,
+            'times': dict(self.times),
+            'calls': dict(self.calls),
+            # JSON keys must be strings; lists of [f, count] pairs keep f numeric
+            'f_histograms': [sorted(h.items()) for h in self.f_histograms],
+        }
+
+    def to_json(self, path=None, indent=None):
+        text = json.dumps(self.to_dict(), indent=indent)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text + '\n')
+        return text
@@ -0,0 +1,13 @@
+from board import Board
+from packed_board import PackedBoard
+
+GRID = [[1, 2, 3], [4, 5, 6], [7, 0, 8]]
+
+def test_equality_with_other_types_does_not_raise():
+    packed = PackedBoard.from_grid(GRID)
+    assert packed == PackedBoard.from_grid(GRID)
+    assert packed != None
+    assert packed != 'board'
+    # left to Board.__eq__, which compares grids
+    assert packed == Board([row.copy() for row in GRID])
+    assert packed != Board([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
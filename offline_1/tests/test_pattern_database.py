@@ -0,0 +1,26 @@
+import random
+import pytest
+
+from heuristics import PatternDatabase, manhattan_distance
+from packed_board import PackedBoard
+from solver import a_star_search
+
+def _walk(k, steps, seed):
+    rng = random.Random(seed)
+    node = PackedBoard.from_grid([[(i*k + j + 1) % (k*k) for j in range(k)] for i in range(k)])
+    for _ in range(steps):
+        node = rng.choice(node.get_neighbor_nodes())
+    return node.grid
+
+# 5x5 has 25 cells, more than the 16-bit seen entries of the 3x3 and 4x4 builds hold
+def test_5x5_two_tile_table_gives_optimal_costs(tmp_path):
+    pdb = PatternDatabase(5, [(1, 2)], directory=str(tmp_path))
+    for seed in range(3):
+        grid = _walk(5, 20, seed)
+        _, cost, _, _ = a_star_search(PackedBoard.from_grid(grid), pdb)
+        _, expected, _, _ = a_star_search(PackedBoard.from_grid(grid), manhattan_distance)
+        assert cost == expected
+
+def test_sizes_without_default_partitions_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="partitions="):
+        PatternDatabase(5, directory=str(tmp_path))
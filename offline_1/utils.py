@@ -1,7 +1,26 @@
 def flatten_board(board):
-    return [val for row in board.grid for val in row if val != 0]
+    return [val for val in board.tiles() if val != 0]
 
+# O(n log n): walk the tiles right to left, asking a Fenwick tree how many smaller
+# tiles have already been seen (i.e. sit to the right)
 def inversion_count(board):
+    flattened_list = flatten_board(board)
+    size = len(flattened_list) + 1
+    tree = [0] * (size + 1)
+    count = 0
+    for val in reversed(flattened_list):
+        i = val - 1
+        while i > 0:
+            count += tree[i]
+            i -= i & -i
+        i = val
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return count
+
+# The original O(n^2) pair count, kept as a reference for benchmark.py
+def inversion_count_quadratic(board):
     count = 0
     
     flattened_list = flatten_board(board)
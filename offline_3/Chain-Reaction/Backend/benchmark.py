@@ -0,0 +1,560 @@
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from typing import List, Optional
+
+from improved_chain_reaction import (ChainReactionGame, ChainReactionHeuristics, ExplosionWave, MCTSAI, MinimaxAI,
+                                     Player)
+
+HEURISTICS = {
+    'orb_count': ChainReactionHeuristics.orb_count_heuristic,
+    'explosion_potential': ChainReactionHeuristics.explosion_potential_heuristic,
+    'strategic_control': ChainReactionHeuristics.strategic_control_heuristic,
+    'growth_potential': ChainReactionHeuristics.growth_potential_heuristic,
+    'threat_analysis': ChainReactionHeuristics.threat_analysis_heuristic,
+    'tempo': ChainReactionHeuristics.tempo_heuristic,
+    'combined_v2': ChainReactionHeuristics.combined_heuristic_v2,
+}
+
+def random_position(rows: int, cols: int, moves: int, rng: random.Random) -> ChainReactionGame:
+    """Play `moves` random legal moves from an empty board (fewer if the game ends)"""
+    game = ChainReactionGame(rows, cols)
+    for _ in range(moves):
+        if game.game_over:
+            break
+        player = game.current_player
+        game.make_move(*rng.choice(game.get_valid_moves(player)), player)
+    return game
+
+class ReferenceCell:
+    """The original board cell: an orb count and an owner"""
+    def __init__(self):
+        self.orbs = 0
+        self.player = Player.EMPTY
+
+class ReferenceGame:
+    """The original engine, independent of the current one: a grid of Cell objects, rescanned
+    for every wave and for every game-over check. The move and explosion logic is the
+    original code (less the interactive sleep), plus logging of explosions and waves, so the
+    worklist engine can be checked against it."""
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.board = [[ReferenceCell() for _ in range(cols)] for _ in range(rows)]
+        self.current_player = Player.RED
+        self.game_over = False
+        self.winner = None
+        self.move_count = 0
+        self._initialize_critical_mass_cache()
+        self.explosions = []
+
+    def _initialize_critical_mass_cache(self):
+        self.critical_mass_cache = {}
+        for row in range(self.rows):
+            for col in range(self.cols):
+                neighbors = 0
+                for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                    nr, nc = row + dr, col + dc
+                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                        neighbors += 1
+                self.critical_mass_cache[(row, col)] = neighbors
+
+    def get_critical_mass(self, row: int, col: int) -> int:
+        return self.critical_mass_cache.get((row, col), 0)
+
+    def is_valid_move(self, row: int, col: int, player: Player) -> bool:
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+        cell = self.board[row][col]
+        return cell.player == Player.EMPTY or cell.player == player
+
+    def set_cell(self, row: int, col: int, orbs: int, player: Player):
+        self.board[row][col].orbs = orbs
+        self.board[row][col].player = player
+
+    def make_move(self, row: int, col: int, player: Player, waves: Optional[List[ExplosionWave]] = None) -> bool:
+        if not self.is_valid_move(row, col, player) or self.game_over:
+            return False
+
+        self.board[row][col].orbs += 1
+        self.board[row][col].player = player
+        self.move_count += 1
+
+        self._handle_explosions(waves)
+        self._check_win_condition()
+        if not self.game_over:
+            self.current_player = Player.BLUE if self.current_player == Player.RED else Player.RED
+        return True
+
+    def _handle_explosions(self, waves: Optional[List[ExplosionWave]] = None):
+        explosion_occurred = True
+        iteration_count = 0
+        max_iterations = 1000000
+
+        while explosion_occurred and iteration_count < max_iterations:
+            explosion_occurred = False
+            iteration_count += 1
+
+            exploding_cells = []
+            for row in range(self.rows):
+                for col in range(self.cols):
+                    cell = self.board[row][col]
+                    critical_mass = self.get_critical_mass(row, col)
+                    if cell.orbs >= critical_mass and cell.player != Player.EMPTY:
+                        exploding_cells.append((row, col))
+
+            if exploding_cells:
+                explosion_occurred = True
+                for row, col in exploding_cells:
+                    self._explode_cell(row, col)
+                if waves is not None:
+                    waves.append(self._wave(exploding_cells))
+                if self._is_game_over_during_explosions():
+                    break
+
+    def _is_game_over_during_explosions(self) -> bool:
+        red_orbs, blue_orbs = self._orb_totals()
+        total_orbs = red_orbs + blue_orbs
+        if total_orbs > 0 and self.move_count > 2:
+            return (red_orbs == 0 and blue_orbs > 0) or (blue_orbs == 0 and red_orbs > 0)
+        return False
+
+    def _explode_cell(self, row: int, col: int):
+        self.explosions.append(row * self.cols + col)
+        cell = self.board[row][col]
+        exploding_player = cell.player
+        critical_mass = self.get_critical_mass(row, col)
+        orbs_to_distribute = critical_mass
+        cell.orbs -= orbs_to_distribute
+        if cell.orbs <= 0:
+            cell.orbs = 0
+            cell.player = Player.EMPTY
+
+        neighbors = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        for dr, dc in neighbors:
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                neighbor_cell = self.board[nr][nc]
+                neighbor_cell.orbs += 1
+                neighbor_cell.player = exploding_player
+
+    def _check_win_condition(self):
+        red_orbs, blue_orbs = self._orb_totals()
+        total_orbs = red_orbs + blue_orbs
+        if total_orbs > 0 and self.move_count >= 2:
+            if red_orbs > 0 and blue_orbs == 0:
+                self.game_over = True
+                self.winner = Player.RED
+            elif blue_orbs > 0 and red_orbs == 0:
+                self.game_over = True
+                self.winner = Player.BLUE
+
+    def _orb_totals(self):
+        red_orbs = blue_orbs = 0
+        for row in self.board:
+            for cell in row:
+                if cell.player == Player.RED:
+                    red_orbs += cell.orbs
+                elif cell.player == Player.BLUE:
+                    blue_orbs += cell.orbs
+        return red_orbs, blue_orbs
+
+    @property
+    def cells(self) -> array:
+        """Signed flat cell values, positive for Red, in the current engine's layout"""
+        return array('b', [cell.orbs if cell.player == Player.RED else -cell.orbs if cell.player == Player.BLUE else 0
+                           for row in self.board for cell in row])
+
+    def _wave(self, exploding_cells: list) -> ExplosionWave:
+        """The wave just processed, with every cell it wrote: the exploded cells and their neighbors"""
+        touched = set()
+        for row, col in exploding_cells:
+            touched.add(row * self.cols + col)
+            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nr, nc = row + dr, col + dc
+                if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                    touched.add(nr * self.cols + nc)
+        cells = self.cells
+        return ExplosionWave([row * self.cols + col for row, col in exploding_cells],
+                             {i: cells[i] for i in sorted(touched)}, *self._orb_totals())
+
+class RecordingGame(ChainReactionGame):
+    """The current engine, logging explosions in the order they happen"""
+
+    def __init__(self, rows: int, cols: int):
+        super().__init__(rows, cols)
+        self.explosions = []
+
+    def _explode_index(self, index: int):
+        self.explosions.append(index)
+        super()._explode_index(index)
+
+def game_state(game: ChainReactionGame) -> tuple:
+    return (game.cells.tobytes(), game.red_orbs, game.blue_orbs, game._unsettled,
+            game.current_player, game.move_count, game.game_over, game.winner)
+
+def verify_explosions(games: int, seed: int) -> int:
+    """Play seeded random games on both engines and compare them, and their explosion waves, after every
+    move; also check that make_move(record_undo=True) followed by unmake_move restores the position"""
+    rng = random.Random(seed)
+    moves = 0
+    for number in range(games):
+        rows, cols = rng.randint(3, 10), rng.randint(3, 10)
+        current, reference = RecordingGame(rows, cols), ReferenceGame(rows, cols)
+        if number % 4 == 3:
+            #start some games from a hand-made position with cells already at critical mass
+            for index in rng.sample(range(rows * cols), rng.randint(1, rows * cols // 2)):
+                row, col = divmod(index, cols)
+                player = rng.choice([Player.RED, Player.BLUE])
+                orbs = rng.randint(1, current.critical[index] + 1)
+                current.set_cell(row, col, orbs, player)
+                reference.set_cell(row, col, orbs, player)
+            current.move_count = reference.move_count = 2
+        while not current.game_over and current.move_count < 500:
+            player = current.current_player
+            before = game_state(current)
+            current.make_move(*rng.choice(current.get_valid_moves(player)), player, record_undo=True)
+            current.unmake_move()
+            assert game_state(current) == before, f"unmake_move did not restore game {number} move {current.move_count}"
+            del current.explosions[len(reference.explosions):]
+            move = rng.choice(current.get_valid_moves(player))
+            current_waves, reference_waves = [], []
+            assert current.make_move(*move, player, waves=current_waves) == \
+                reference.make_move(*move, player, waves=reference_waves)
+            moves += 1
+            where = f"game {number} ({rows}x{cols}) move {current.move_count}"
+            assert current.explosions == reference.explosions, f"explosion order differs at {where}"
+            assert [wave.to_dict() for wave in current_waves] == [wave.to_dict() for wave in reference_waves], \
+                f"explosion waves differ at {where}"
+            assert current.cells == reference.cells, f"board differs at {where}"
+            assert current._orb_totals() == reference._orb_totals(), f"orb totals differ at {where}"
+            assert current.hash == current.compute_hash(), f"incremental hash is stale at {where}"
+            assert (current.game_over, current.winner, current.current_player) == \
+                (reference.game_over, reference.winner, reference.current_player), f"game state differs at {where}"
+    print(f"Worklist and full-scan engines agree on {games} games, {moves} moves")
+    return moves
+
+def bench_minimax(rows: int, cols: int, depth: int, heuristic: str, positions: int, seed: int,
+                  table_size: int = 1 << 16, time_budget_ms: Optional[int] = None, batch_leaves: bool = False):
+    """Time MinimaxAI.get_best_move on seeded mid-game positions"""
+    rng = random.Random(seed)
+    games = [random_position(rows, cols, rng.randint(6, 30), rng) for _ in range(positions)]
+    games = [game for game in games if not game.game_over]
+    total_nodes = 0
+    total_time = 0.0
+    total_collections = 0
+    total_hits = 0
+    print(f"{'#':>3} {'moves':>6} {'depth':>5} {'nodes':>9} {'time (s)':>9} {'nodes/s':>10} {'tt hits':>8} {'gc runs':>8}  best move")
+    for idx, game in enumerate(games):
+        ai = MinimaxAI(game.current_player, depth, heuristic_func=HEURISTICS[heuristic], table_size=table_size,
+                       time_budget_ms=time_budget_ms, batch_leaves=batch_leaves)
+        ai.max_search_time = float('inf')
+        #garbage-collector passes (all generations) during the search, as a measure of allocation churn
+        collections = sum(generation['collections'] for generation in gc.get_stats())
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            move = ai.get_best_move(game)
+        elapsed = time.perf_counter() - start
+        collections = sum(generation['collections'] for generation in gc.get_stats()) - collections
+        total_nodes += ai.nodes_evaluated
+        total_time += elapsed
+        total_collections += collections
+        total_hits += ai.cache_hits
+        print(f"{idx:>3} {game.move_count:>6} {ai.depth_reached:>5} {ai.nodes_evaluated:>9} {elapsed:>9.3f} "
+              f"{ai.nodes_evaluated / elapsed:>10.0f} {ai.cache_hits:>8} {collections:>8}  {move}")
+    print(f"Total: {total_nodes} nodes in {total_time:.3f}s, {total_nodes / max(total_time, 1e-9):.0f} nodes/s, "
+          f"{total_hits} tt hits, {total_collections} gc runs")
+
+def bench_parallel(rows: int, cols: int, depth: int, heuristic: str, positions: int, seed: int,
+                   worker_counts: List[int]):
+    """Time fixed-depth searches with each worker count against the serial search"""
+    rng = random.Random(seed)
+    games = [random_position(rows, cols, rng.randint(6, 30), rng) for _ in range(positions)]
+    games = [game for game in games if not game.game_over]
+    serial_time = None
+    serial_moves = None
+    print(f"{'workers':>7} {'time (s)':>9} {'speedup':>8} {'nodes':>9}  moves match serial")
+    for workers in [1] + [count for count in worker_counts if count != 1]:
+        ai_by_player = {}
+        elapsed = 0.0
+        nodes = 0
+        moves = []
+        for game in games:
+            ai = ai_by_player.get(game.current_player)
+            if ai is None:
+                ai = ai_by_player[game.current_player] = MinimaxAI(
+                    game.current_player, depth, heuristic_func=HEURISTICS[heuristic], workers=workers)
+                ai.max_search_time = float('inf')
+                ai.max_nodes = 10 ** 12
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                moves.append(ai.get_best_move(game))
+            elapsed += time.perf_counter() - start
+            nodes += ai.nodes_evaluated
+        for ai in ai_by_player.values():
+            ai.close()
+        if serial_time is None:
+            serial_time, serial_moves = elapsed, moves
+        print(f"{workers:>7} {elapsed:>9.3f} {serial_time / elapsed:>8.2f} {nodes:>9}  {moves == serial_moves}")
+
+def bench_heuristics(rows: int, cols: int, positions: int, seed: int):
+    """Check the NumPy heuristics against the loop versions and time both, per board and batched"""
+    import numpy as np
+    from vectorized_heuristics import VectorizedHeuristics, score_boards
+    rng = random.Random(seed)
+    games = [random_position(rows, cols, rng.randint(0, rows * cols * 2), rng) for _ in range(positions)]
+    boards = np.array([np.frombuffer(game.cells, dtype=np.int8) for game in games])
+    move_counts = np.array([game.move_count for game in games])
+    print(f"{'heuristic':<20} {'max diff':>9} {'loop us':>9} {'numpy us':>9} {'batch us':>9}")
+    for name, heuristic in HEURISTICS.items():
+        vectorized = getattr(VectorizedHeuristics, heuristic.__name__)
+        start = time.perf_counter()
+        loop_scores = [heuristic(game, Player.RED) for game in games]
+        loop_time = time.perf_counter() - start
+        start = time.perf_counter()
+        numpy_scores = [vectorized(game, Player.RED) for game in games]
+        numpy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        batch_scores = score_boards(heuristic, boards, rows, cols, Player.RED, move_counts)
+        batch_time = time.perf_counter() - start
+        max_diff = max(max(abs(a - b), abs(a - c)) for a, b, c in zip(loop_scores, numpy_scores, batch_scores))
+        print(f"{name:<20} {max_diff:>9.2e} {loop_time / positions * 1e6:>9.1f} "
+              f"{numpy_time / positions * 1e6:>9.1f} {batch_time / positions * 1e6:>9.1f}")
+
+def bench_state(rows: int, cols: int, games: int, seed: int):
+    """Serialize and parse cost per turn of the text format against the versioned state records"""
+    rng = random.Random(seed)
+    turns = []
+    for _ in range(games):
+        game = ChainReactionGame(rows, cols)
+        while not game.game_over and game.move_count < rows * cols * 2:
+            previous = game.copy()
+            game.make_move(*rng.choice(game.get_valid_moves(game.current_player)), game.current_player)
+            turns.append((previous, game.copy()))
+    formats = {
+        'text': (lambda previous, game: game.to_file_format("Move Processed"),
+                 lambda previous, data: ChainReactionGame.from_text(data)),
+        'json snapshot': (lambda previous, game: json.dumps(game.snapshot(binary=False)),
+                          lambda previous, data: ChainReactionGame.from_state(json.loads(data))),
+        'binary snapshot': (lambda previous, game: game.snapshot(),
+                            lambda previous, data: ChainReactionGame.from_state(data)),
+        #applying a delta moves the previous position forward in place, so time it on a copy made beforehand
+        'binary delta': (lambda previous, game: game.delta(previous),
+                         lambda previous, data: previous.apply_state(data)),
+    }
+    print(f"{rows}x{cols}, {len(turns)} turns")
+    print(f"{'format':<16} {'bytes':>7} {'write us':>9} {'parse us':>9}")
+    for name, (write, parse) in formats.items():
+        start = time.perf_counter()
+        records = [write(previous, game) for previous, game in turns]
+        write_time = time.perf_counter() - start
+        bases = [previous.copy() for previous, _ in turns]
+        start = time.perf_counter()
+        for base, data in zip(bases, records):
+            parse(base, data)
+        parse_time = time.perf_counter() - start
+        size = sum(len(data) for data in records) / len(records)
+        print(f"{name:<16} {size:>7.0f} {write_time / len(turns) * 1e6:>9.1f} {parse_time / len(turns) * 1e6:>9.1f}")
+
+def _server_request(conn: socket.socket, request: dict) -> dict:
+    data = json.dumps(request).encode()
+    conn.sendall(len(data).to_bytes(4, 'big') + data)
+    reply = b''
+    while len(reply) < 4 or len(reply) < 4 + int.from_bytes(reply[:4], 'big'):
+        chunk = conn.recv(65536)
+        if not chunk:
+            raise ConnectionError("server closed the connection")
+        reply += chunk
+    return json.loads(reply[4:])
+
+def bench_server(rows: int, cols: int, difficulty: str, heuristic: str, games: int):
+    """Round-trip latency of bridge_mode.py --server against the search time it reports"""
+    path = os.path.join(tempfile.mkdtemp(), 'bridge.sock')
+    server = subprocess.Popen([sys.executable, 'bridge_mode.py', '--server', '--socket', path],
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.perf_counter() + 10
+        while not os.path.exists(path):
+            if time.perf_counter() > deadline or server.poll() is not None:
+                raise RuntimeError("bridge server did not start")
+            time.sleep(0.01)
+        conn = socket.socket(socket.AF_UNIX)
+        conn.connect(path)
+        ai = {'type': 'Smart', 'difficulty': difficulty, 'heuristic': heuristic}
+        config = {'rows': rows, 'cols': cols, 'mode': 'AI vs AI', 'redAI': ai, 'blueAI': ai}
+        latencies, searches = [], []
+        for _ in range(games):
+            state = _server_request(conn, {'op': 'init', 'config': config})['state']
+            while not state['gameOver'] and state['moveCount'] < rows * cols * 2:
+                start = time.perf_counter()
+                response = _server_request(conn, {'op': 'ai_move'})
+                latencies.append((time.perf_counter() - start) * 1000)
+                state = response['state']
+                searches.append(state['searchMs'])
+        conn.close()
+    finally:
+        server.terminate()
+        server.wait()
+    overhead = [latency - search for latency, search in zip(latencies, searches)]
+    print(f"{rows}x{cols}, {difficulty} {heuristic}, {len(latencies)} AI moves")
+    print(f"round trip {sum(latencies) / len(latencies):.2f} ms, search {sum(searches) / len(searches):.2f} ms, "
+          f"overhead {sum(overhead) / len(overhead):.2f} ms mean / {max(overhead):.2f} ms max")
+
+def bench_sessions(rows: int, cols: int, sessions: int, moves: int, difficulty: str, workers: List[int]):
+    """Concurrent AI vs AI sessions on GameService: throughput and per-move latency by pool size"""
+    from game_service import GameService
+    ai = {'type': 'Smart', 'difficulty': difficulty, 'heuristic': 'combined_v2'}
+    config = {'rows': rows, 'cols': cols, 'mode': 'AI vs AI', 'redAI': ai, 'blueAI': ai}
+
+    async def play(service: GameService):
+        session = service.create_session(config)
+        for _ in range(moves):
+            if session.game.game_over:
+                break
+            await service.ai_move(session.session_id)
+        return session
+
+    async def run(worker_count: int):
+        service = GameService(worker_count, max_sessions=sessions)
+        try:
+            start = time.perf_counter()
+            played = await asyncio.gather(*(play(service) for _ in range(sessions)))
+            elapsed = time.perf_counter() - start
+            return elapsed, played, service.metrics()
+        finally:
+            service.shutdown()
+
+    print(f"{sessions} sessions x {moves} moves, {rows}x{cols} {difficulty}")
+    print(f"{'workers':>7} {'moves/s':>8} {'queue p50':>10} {'queue p95':>10} {'search p50':>11} "
+          f"{'total p95':>10} {'fairness':>9}")
+    for worker_count in workers:
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed, played, metrics = asyncio.run(run(worker_count))
+        total_moves = sum(session.moves for session in played)
+        #slowest session's mean request latency over the fastest one's; 1.0 is perfectly even
+        means = [sum(session.total_ms) / len(session.total_ms) for session in played if session.total_ms]
+        print(f"{worker_count:>7} {total_moves / elapsed:>8.1f} {metrics['queueMs']['p50']:>10.1f} "
+              f"{metrics['queueMs']['p95']:>10.1f} {metrics['searchMs']['p50']:>11.1f} "
+              f"{metrics['totalMs']['p95']:>10.1f} {max(means) / min(means):>9.2f}")
+
+def bench_mcts(rows: int, cols: int, time_budget_ms: int, games: int, rollout: str, heuristic: str, depth: int,
+               seed: int):
+    """MCTSAI against MinimaxAI with the same per-move time budget, alternating colors"""
+    heuristic_func = HEURISTICS[heuristic]
+    results = {'mcts': 0, 'minimax': 0, 'unfinished': 0}
+    rates, depths = [], []
+    print(f"{rows}x{cols}, {time_budget_ms} ms per move, MCTS {rollout} rollouts vs minimax {heuristic} up to depth {depth}")
+    for number in range(games):
+        mcts_player = Player.RED if number % 2 == 0 else Player.BLUE
+        minimax_player = Player.BLUE if mcts_player is Player.RED else Player.RED
+        mcts = MCTSAI(mcts_player, time_budget_ms=time_budget_ms, rollout=rollout, heuristic_func=heuristic_func,
+                      seed=seed + number)
+        minimax = MinimaxAI(minimax_player, depth, heuristic_func=heuristic_func, keep_table=True,
+                            time_budget_ms=time_budget_ms)
+        game = ChainReactionGame(rows, cols)
+        with contextlib.redirect_stdout(io.StringIO()):
+            while not game.game_over and game.move_count < rows * cols * 4:
+                ai = mcts if game.current_player is mcts_player else minimax
+                game.make_move(*ai.get_best_move(game), game.current_player)
+                if ai is mcts:
+                    rates.append(mcts.playouts_per_second)
+                else:
+                    depths.append(minimax.depth_reached)
+        winner = 'unfinished' if not game.game_over else 'mcts' if game.winner is mcts_player else 'minimax'
+        results[winner] += 1
+        print(f"game {number}: MCTS as {mcts_player.value}, {winner} after {game.move_count} moves")
+    print(f"MCTS {results['mcts']} - {results['minimax']} minimax, {results['unfinished']} unfinished; "
+          f"MCTS {sum(rates) / len(rates):,.0f} playouts/s, minimax mean depth {sum(depths) / len(depths):.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Chain Reaction engine benchmarks")
+    sub = parser.add_subparsers(dest='bench', required=True)
+    minimax = sub.add_parser('minimax', help="MinimaxAI node throughput on seeded positions")
+    minimax.add_argument('--rows', type=int, default=8)
+    minimax.add_argument('--cols', type=int, default=8)
+    minimax.add_argument('--depth', type=int, default=3)
+    minimax.add_argument('--heuristic', choices=HEURISTICS, default='combined_v2')
+    minimax.add_argument('--positions', type=int, default=5)
+    minimax.add_argument('--seed', type=int, default=7)
+    minimax.add_argument('--table-size', type=int, default=1 << 16, help="transposition table slots (power of two)")
+    minimax.add_argument('--time-budget-ms', type=int, default=None,
+                         help="per-move budget; --depth is then the deepest iteration tried")
+    minimax.add_argument('--batch-leaves', action='store_true', help="score depth-1 children in one NumPy call")
+    parallel = sub.add_parser('parallel', help="parallel root search speedup by worker count")
+    parallel.add_argument('--rows', type=int, default=8)
+    parallel.add_argument('--cols', type=int, default=7)
+    parallel.add_argument('--depth', type=int, default=4)
+    parallel.add_argument('--heuristic', choices=HEURISTICS, default='combined_v2')
+    parallel.add_argument('--positions', type=int, default=4)
+    parallel.add_argument('--seed', type=int, default=7)
+    parallel.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8, 16])
+    heuristics = sub.add_parser('heuristics', help="NumPy heuristics against the loop versions")
+    heuristics.add_argument('--rows', type=int, default=8)
+    heuristics.add_argument('--cols', type=int, default=8)
+    heuristics.add_argument('--positions', type=int, default=2000)
+    heuristics.add_argument('--seed', type=int, default=7)
+    state = sub.add_parser('state', help="game state serialization cost per turn by format")
+    state.add_argument('--rows', type=int, default=10)
+    state.add_argument('--cols', type=int, default=10)
+    state.add_argument('--games', type=int, default=20)
+    state.add_argument('--seed', type=int, default=7)
+    server = sub.add_parser('server', help="bridge_mode.py --server round-trip latency against search time")
+    server.add_argument('--rows', type=int, default=8)
+    server.add_argument('--cols', type=int, default=7)
+    server.add_argument('--difficulty', choices=('Easy', 'Medium', 'Hard'), default='Easy')
+    server.add_argument('--heuristic', choices=HEURISTICS, default='combined_v2')
+    server.add_argument('--games', type=int, default=3)
+    sessions = sub.add_parser('sessions', help="GameService throughput and latency with many concurrent games")
+    sessions.add_argument('--rows', type=int, default=6)
+    sessions.add_argument('--cols', type=int, default=6)
+    sessions.add_argument('--sessions', type=int, default=50)
+    sessions.add_argument('--moves', type=int, default=10, help="AI moves per session")
+    sessions.add_argument('--difficulty', choices=('Easy', 'Medium', 'Hard'), default='Easy')
+    sessions.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    mcts = sub.add_parser('mcts', help="MCTSAI against MinimaxAI at equal time per move")
+    mcts.add_argument('--rows', type=int, default=6)
+    mcts.add_argument('--cols', type=int, default=6)
+    mcts.add_argument('--time-budget-ms', type=int, default=500)
+    mcts.add_argument('--games', type=int, default=4)
+    mcts.add_argument('--rollout', choices=('random', 'heuristic'), default='random')
+    mcts.add_argument('--heuristic', choices=HEURISTICS, default='combined_v2')
+    mcts.add_argument('--depth', type=int, default=6, help="deepest minimax iteration within the budget")
+    mcts.add_argument('--seed', type=int, default=7)
+    verify = sub.add_parser('verify', help="check the explosion engine against the full-scan reference")
+    verify.add_argument('--games', type=int, default=500)
+    verify.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    if args.bench == 'minimax':
+        bench_minimax(args.rows, args.cols, args.depth, args.heuristic, args.positions, args.seed, args.table_size,
+                      args.time_budget_ms, args.batch_leaves)
+    elif args.bench == 'parallel':
+        bench_parallel(args.rows, args.cols, args.depth, args.heuristic, args.positions, args.seed, args.workers)
+    elif args.bench == 'heuristics':
+        bench_heuristics(args.rows, args.cols, args.positions, args.seed)
+    elif args.bench == 'state':
+        bench_state(args.rows, args.cols, args.games, args.seed)
+    elif args.bench == 'server':
+        bench_server(args.rows, args.cols, args.difficulty, args.heuristic, args.games)
+    elif args.bench == 'sessions':
+        bench_sessions(args.rows, args.cols, args.sessions, args.moves, args.difficulty, args.workers)
+    elif args.bench == 'mcts':
+        bench_mcts(args.rows, args.cols, args.time_budget_ms, args.games, args.rollout, args.heuristic, args.depth,
+                   args.seed)
+    elif args.bench == 'verify':
+        verify_explosions(args.games, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,44 @@
+import argparse
+import asyncio
 import json
 import sys
 import os
 import time
 from improved_chain_reaction import *
+
+#Server mode frames every message as a 4-byte big-endian length followed by that many bytes of UTF-8 JSON
+MAX_MESSAGE_BYTES = 1 << 20
+
 class BridgeGameController(GameController):
     def __init__(self):
         super().__init__()
         self.bridge_mode = True
         self.config_file = "backend_config.json"
+        #parsed config and the config file's mtime when it was read
+        self.config = None
+        self.config_mtime = None
+        #player -> (settings, AI), kept across commands so search work carries over between turns
+        self.ais = {}
         
     def load_config(self):
-        """Load configuration from JSON file"""
+        """Load configuration from JSON file, reparsing it only when the file has changed"""
         try:
+            mtime = os.stat(self.config_file).st_mtime_ns
+            if self.config is not None and mtime == self.config_mtime:
+                return self.config
             with open(self.config_file, 'r') as f:
-                return json.load(f)
+                config = json.load(f)
         except FileNotFoundError:
             print(f"Config file {self.config_file} not found", file=sys.stderr)
             return None
         except json.JSONDecodeError:
             print(f"Invalid JSON in {self.config_file}", file=sys.stderr)
             return None
+        if self.config is not None:
+            print("Config file changed, reloaded", file=sys.stderr)
+        self.config = config
+        self.config_mtime = mtime
+        return config
     
     def process_move_request(self):
         """Process a move request from the frontend"""
@@ -27,13 +46,12 @@ class BridgeGameController(GameController):
             if not os.path.exists(self.game_state_file):
                 print("Game state file not found", file=sys.stderr)
                 return False
-                
-            self.game = ChainReactionGame.load_from_file(self.game_state_file)
             
             with open(self.game_state_file, 'r') as f:
                 content = f.read()
-                if "AI Turn Request:" in content:
-                    return self.make_ai_move()
+            self.sync_game(content)
+            if "AI Turn Request:" in content:
+                return self.make_ai_move()
                     
             return True
         except Exception as e:
@@ -51,30 +69,7 @@ class BridgeGameController(GameController):
                 return False
                 
             current_player = self.game.current_player
-            
-            ai_player = current_player  
-
-            if config.get('mode') == 'AI vs AI' and 'redAI' in config and 'blueAI' in config:
-                #specific AI configuration based on current player
-                if current_player.value == 'Red':
-                    ai_config = config['redAI']
-                else:
-                    ai_config = config['blueAI']
-                
-                if ai_config.get('type') == 'Random':
-                    ai = RandomAI(ai_player)
-                else:
-                    depth = self.get_difficulty_depth(ai_config.get('difficulty', 'Medium'))
-                    heuristic_func = self.get_heuristic_function(ai_config.get('heuristic', 'combined_v2'))
-                    ai = MinimaxAI(ai_player, depth, heuristic_func=heuristic_func)
-            else:
-                #single AI configuration
-                if config.get('aiType') == 'Random':
-                    ai = RandomAI(ai_player)
-                else:
-                    depth = self.get_difficulty_depth(config.get('difficulty', 'Medium'))
-                    heuristic_func = self.get_heuristic_function(config.get('heuristic', 'combined_v2'))
-                    ai = MinimaxAI(ai_player, depth, heuristic_func=heuristic_func)
+            ai = self.get_ai(current_player, config)
             
             #AI move
             move = ai.get_best_move(self.game)
@@ -102,6 +97,26 @@ class BridgeGameController(GameController):
         }
         return difficulty_map.get(difficulty, 3)
     
+    def get_difficulty_budget(self, difficulty):
+        """Convert difficulty string to an MCTS time budget in milliseconds"""
+        budget_map = {
+            'Easy': 250,
+            'Medium': 1000,
+            'Hard': 3000
+        }
+        return budget_map.get(difficulty, 1000)
+        
+    def get_time_budget(self, ai_config, config=None):
+        """Per-move search budget in milliseconds: the AI's own timeBudgetMs, else the game-wide one"""
+        budget = ai_config.get('timeBudgetMs')
+        if budget is None and config is not None:
+            budget = config.get('timeBudgetMs')
+        try:
+            return int(budget) if budget is not None else None
+        except (TypeError, ValueError):
+            print(f"Ignoring invalid timeBudgetMs: {budget}", file=sys.stderr)
+            return None
+    
     def get_heuristic_function(self, heuristic_name):
         """Get heuristic function from name"""
         heuristic_map = {
@@ -115,6 +130,83 @@ class BridgeGameController(GameController):
         }
         return heuristic_map.get(heuristic_name, ChainReactionHeuristics.combined_heuristic_v2)
     
+    def get_ai(self, player, config):
+        """The player's AI for the config, reused across turns while its settings stay the same"""
+        if config.get('mode') == 'AI vs AI' and 'redAI' in config and 'blueAI' in config:
+            #specific AI configuration based on the player
+            ai_config = config['redAI'] if player == Player.RED else config['blueAI']
+            ai_type = ai_config.get('type')
+            time_budget_ms = self.get_time_budget(ai_config, config)
+        else:
+            #single AI configuration
+            ai_config = config
+            ai_type = config.get('aiType')
+            time_budget_ms = self.get_time_budget(config)
+        
+        if ai_type == 'Random':
+            settings = ('Random',)
+        elif ai_type == 'MCTS':
+            #without timeBudgetMs, the difficulty sets how long MCTS searches
+            settings = ('MCTS', time_budget_ms or self.get_difficulty_budget(ai_config.get('difficulty', 'Medium')),
+                        ai_config.get('rollout', 'random'), ai_config.get('heuristic', 'combined_v2'))
+        else:
+            settings = (self.get_difficulty_depth(ai_config.get('difficulty', 'Medium')),
+                        ai_config.get('heuristic', 'combined_v2'), time_budget_ms)
+        cached = self.ais.get(player)
+        if cached is not None and cached[0] == settings:
+            return cached[1]
+        if cached is not None and isinstance(cached[1], MinimaxAI):
+            cached[1].close()
+        
+        if ai_type == 'Random':
+            ai = RandomAI(player)
+            print(f"Created Random AI for {player.value}", file=sys.stderr)
+        elif ai_type == 'MCTS':
+            _, budget, rollout, heuristic = settings
+            ai = MCTSAI(player, time_budget_ms=budget, rollout=rollout,
+                        heuristic_func=self.get_heuristic_function(heuristic))
+            print(f"Created MCTS AI for {player.value} with {rollout} rollouts, heuristic {heuristic} and time budget {budget} ms", file=sys.stderr)
+        else:
+            depth, heuristic, _ = settings
+            #keep_table: the transposition table carries over to the player's next turn
+            ai = MinimaxAI(player, depth, heuristic_func=self.get_heuristic_function(heuristic),
+                           keep_table=True, time_budget_ms=time_budget_ms)
+            print(f"Created Minimax AI for {player.value} with depth {depth}, heuristic {heuristic} and time budget {time_budget_ms} ms", file=sys.stderr)
+        self.ais[player] = (settings, ai)
+        return ai
+    
+    def close_ais(self):
+        """Drop the cached AIs, shutting down any search process pools"""
+        for _, ai in self.ais.values():
+            if isinstance(ai, MinimaxAI):
+                ai.close()
+        self.ais = {}
+    
+    def sync_game(self, content):
+        """Keep the in-memory game while the state file shows its board, otherwise reload it from the file"""
+        board_lines = [line.strip() for line in content.split('Board:', 1)[-1].split('\n')
+                       if line.strip() and ':' not in line]
+        if self.game is not None and board_lines == [self.game._row_str(row) for row in range(self.game.rows)]:
+            return self.game
+        
+        previous = self.game
+        self.game = None
+        try:
+            #parsed in memory by the game engine's text reader
+            self.game = ChainReactionGame.from_text(self.convert_to_game_engine_format(content))
+        except Exception as e:
+            print(f"Failed to load using game engine method: {e}", file=sys.stderr)
+            #manual parsing
+            self.game = self.parse_game_state_from_file(content)
+        
+        #orbs on the board only ever grow during a game, so fewer of them means a new one started
+        if previous is not None and (self.game is None or (self.game.rows, self.game.cols) != (previous.rows, previous.cols)
+                                     or self.game.red_orbs + self.game.blue_orbs < previous.red_orbs + previous.blue_orbs):
+            print("New game detected, resetting AIs and config", file=sys.stderr)
+            self.close_ais()
+            self.config = None
+        return self.game
+    
     def run_bridge_mode(self):
         """Run in bridge mode - process commands from stdin"""
         print("Bridge mode started", file=sys.stderr)
@@ -153,6 +245,7 @@ class BridgeGameController(GameController):
                 print(f"Error in bridge mode: {e}", file=sys.stderr)
                 break
         
+        self.close_ais()
         print("Bridge mode ended", file=sys.stderr)
     
     def process_human_move(self):
@@ -191,23 +284,8 @@ class BridgeGameController(GameController):
             from improved_chain_reaction import Player, ChainReactionGame
             player = Player.RED if player_str == 'RED' else Player.BLUE
             
-            # Load or create game instance
-            if self.game is None:
-                try:
-                    #temporary format that the game engine can read
-                    temp_content = self.convert_to_game_engine_format(content)
-                    temp_file = self.game_state_file + '.temp'
-                    with open(temp_file, 'w') as f:
-                        f.write(temp_content)
-                    self.game = ChainReactionGame.load_from_file(temp_file)
-                    try:
-                        os.remove(temp_file)
-                    except:
-                        pass
-                except Exception as e:
-                    print(f"Failed to load using game engine method: {e}", file=sys.stderr)
-                    #manual parsing
-                    self.game = self.parse_game_state_from_file(content)
+            #Reuse the in-memory game unless the file shows a different board
+            self.sync_game(content)
             
             if self.game is None:
                 print("Failed to load game state", file=sys.stderr)
@@ -220,7 +298,8 @@ class BridgeGameController(GameController):
             if not success:
                 print(f"Invalid move: {player_str} at ({row}, {col})", file=sys.stderr)
                 print(f"Game state: current_player={self.game.current_player.value}", file=sys.stderr)
-                print(f"Cell state: orbs={self.game.board[row][col].orbs}, player={self.game.board[row][col].player.value}", file=sys.stderr)
+                cell = self.game.cell(row, col)
+                print(f"Cell state: orbs={cell.orbs}, player={cell.player.value}", file=sys.stderr)
                 return False
             
             scores = self.game.get_score()
@@ -248,7 +327,8 @@ class BridgeGameController(GameController):
                 result_lines.append(line)
                 board_idx = lines.index(line)
                 for board_line in lines[board_idx + 1:]:
-                    if board_line.strip():
+                    #skip request lines such as AI_MOVE_REQUEST appended after the board
+                    if board_line.strip() and ':' not in board_line:
                         result_lines.append(board_line)
                 break
         
@@ -299,7 +379,6 @@ class BridgeGameController(GameController):
                 print(f"WARNING: Config not available, using parsed dimensions: {rows}x{cols}", file=sys.stderr)
             
             game = ChainReactionGame(rows, cols)
-            game.interactive_mode = True
             
             #Parse each cell 
             for r in range(min(len(board_lines), rows)):
@@ -308,16 +387,13 @@ class BridgeGameController(GameController):
                 for c in range(min(len(cells), cols)):
                     cell_str = cells[c]
                     if cell_str == '⚫':
-                        game.board[r][c].orbs = 0
-                        game.board[r][c].player = Player.EMPTY
+                        game.set_cell(r, c, 0, Player.EMPTY)
                     elif cell_str.startswith('🔴'):
                         orbs = int(cell_str[1:]) if len(cell_str) > 1 else 1
-                        game.board[r][c].orbs = orbs
-                        game.board[r][c].player = Player.RED
+                        game.set_cell(r, c, orbs, Player.RED)
                     elif cell_str.startswith('🔵'):
                         orbs = int(cell_str[1:]) if len(cell_str) > 1 else 1
-                        game.board[r][c].orbs = orbs
-                        game.board[r][c].player = Player.BLUE
+                        game.set_cell(r, c, orbs, Player.BLUE)
             
             #Set game state
             for line in lines:
@@ -370,20 +446,7 @@ class BridgeGameController(GameController):
                 print("No AI move request found", file=sys.stderr)
                 return False
             
-            if self.game is None:
-                try:
-                    temp_content = self.convert_to_game_engine_format(content)
-                    temp_file = self.game_state_file + '.temp'
-                    with open(temp_file, 'w') as f:
-                        f.write(temp_content)
-                    self.game = ChainReactionGame.load_from_file(temp_file)
-                    try:
-                        os.remove(temp_file)
-                    except:
-                        pass
-                except Exception as e:
-                    print(f"Failed to load using game engine method: {e}", file=sys.stderr)
-                    self.game = self.parse_game_state_from_file(content)
+            self.sync_game(content)
             
             if self.game is None:
                 print("Failed to load game state for AI move", file=sys.stderr)
@@ -398,39 +461,13 @@ class BridgeGameController(GameController):
             print(f"AI move: current player is {current_player.value}", file=sys.stderr)
     
             ai_player = current_player  #actual current player from game state
-            
-            if config.get('mode') == 'AI vs AI' and 'redAI' in config and 'blueAI' in config:
-                if current_player.value == 'Red':
-                    ai_config = config['redAI']
-                else:
-                    ai_config = config['blueAI']
-                
-                if ai_config.get('type') == 'Random':
-                    print(f"Using {current_player.value} AI config: Random AI (no difficulty or heuristic needed)", file=sys.stderr)
-                    ai = RandomAI(ai_player)
-                    print(f"Created Random AI for {ai_player.value}", file=sys.stderr)
-                else:
-                    print(f"Using {current_player.value} AI config: {ai_config}", file=sys.stderr)
-                    depth = self.get_difficulty_depth(ai_config.get('difficulty', 'Medium'))
-                    heuristic_func = self.get_heuristic_function(ai_config.get('heuristic', 'combined_v2'))
-                    ai = MinimaxAI(ai_player, depth, heuristic_func=heuristic_func)
-                    print(f"Created Minimax AI for {ai_player.value} with depth {depth} and heuristic {ai_config.get('heuristic')}", file=sys.stderr)
-            else:
-                if config.get('aiType') == 'Random':
-                    print(f"Using legacy Random AI config (no difficulty or heuristic needed)", file=sys.stderr)
-                    ai = RandomAI(ai_player)
-                    print(f"Created Random AI for {ai_player.value}", file=sys.stderr)
-                else:
-                    depth = self.get_difficulty_depth(config.get('difficulty', 'Medium'))
-                    heuristic_func = self.get_heuristic_function(config.get('heuristic', 'combined_v2'))
-                    ai = MinimaxAI(ai_player, depth, heuristic_func=heuristic_func)
-                    print(f"Created Minimax AI for {ai_player.value} with depth {depth}", file=sys.stderr)
-            
+            ai = self.get_ai(ai_player, config)
+                        
             print(f"Getting AI move for {ai_player.value}...", file=sys.stderr)
             move = ai.get_best_move(self.game)
             if move:
                 row, col = move
-                print(f"AI chose move: ({row}, {col})", file=sys.stderr)
+                print(f"AI chose move: ({row}, {col}) at depth {getattr(ai, 'depth_reached', '-')}", file=sys.stderr)
                 success = self.game.make_move(row, col, current_player)
                 
                 if success:
@@ -450,10 +487,138 @@ class BridgeGameController(GameController):
             import traceback
             traceback.print_exc(file=sys.stderr)
             return False
+    
+    def state_response(self, **extra) -> dict:
+        """Success response carrying the game's JSON snapshot"""
+        state = self.game.snapshot(binary=False)
+        state.update(extra)
+        return {'ok': True, 'state': state}
+    
+    def handle_request(self, request: dict) -> dict:
+        """Apply one server request (init, human_move, ai_move or state) to the in-memory game"""
+        op = request.get('op')
+        if op == 'init':
+            #same shape as backend_config.json; a new game drops the previous game's AIs
+            config = request.get('config') or {}
+            self.close_ais()
+            self.config = config
+            self.config_mtime = None
+            self.game = ChainReactionGame(int(config.get('rows', 9)), int(config.get('cols', 6)))
+            return self.state_response()
+        if op not in ('human_move', 'ai_move', 'state'):
+            return {'ok': False, 'error': f"Unknown op: {op}"}
+        if self.game is None:
+            return {'ok': False, 'error': "No game in progress; send init first"}
+        if op == 'state':
+            return self.state_response()
+        if self.game.game_over:
+            return {'ok': False, 'error': "Game is already over"}
+        
+        player = self.game.current_player
+        if op == 'human_move':
+            requested = str(request.get('player', player.value)).upper()
+            if requested != player.value.upper():
+                return {'ok': False, 'error': f"It's not {requested}'s turn. Current player: {player.value.upper()}"}
+            row, col = int(request['row']), int(request['col'])
+            waves = []
+            if not self.game.make_move(row, col, player, waves=waves):
+                return {'ok': False, 'error': f"Invalid move: {player.value} at ({row}, {col})"}
+            return self.state_response(move=[row, col], waves=[wave.to_dict() for wave in waves])
+        
+        ai = self.get_ai(player, self.config or {})
+        start = time.perf_counter()
+        move = ai.get_best_move(self.game)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        waves = []
+        if not move or not self.game.make_move(move[0], move[1], player, waves=waves):
+            return {'ok': False, 'error': f"AI could not find a valid move for {player.value}"}
+        print(f"AI move: {player.value} at {move} in {elapsed_ms:.0f} ms", file=sys.stderr)
+        #the explosion waves let the client animate the chain reaction after the fact
+        return self.state_response(move=list(move), depth=getattr(ai, 'depth_reached', None),
+                                   searchMs=round(elapsed_ms, 1), waves=[wave.to_dict() for wave in waves])
+    
+    async def handle_message(self, request: dict) -> dict:
+        """Server handler: one game per controller, so requests from all connections take turns"""
+        #the search runs in a worker thread to keep the event loop accepting and reading meanwhile
+        async with self.lock:
+            return await asyncio.get_running_loop().run_in_executor(None, self.handle_request, request)
+    
+    async def run_server(self, socket_path: Optional[str] = None, host: str = '127.0.0.1', port: int = 8765):
+        """Serve length-prefixed JSON requests on a Unix domain socket, or on TCP when no path is given"""
+        self.lock = asyncio.Lock()
+        server = await start_message_server(self.handle_message, socket_path, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close_ais()
+
+async def serve_messages(handler, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Answer one connection's length-prefixed JSON requests in order with handler until it closes"""
+    try:
+        while True:
+            try:
+                length = int.from_bytes(await reader.readexactly(4), 'big')
+                if length > MAX_MESSAGE_BYTES:
+                    print(f"Closing connection: {length} byte message is too large", file=sys.stderr)
+                    break
+                body = await reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                break
+            try:
+                request = json.loads(body)
+                response = await handler(request)
+                if 'id' in request:
+                    response['id'] = request['id']
+            except Exception as e:
+                print(f"Error handling request: {e}", file=sys.stderr)
+                response = {'ok': False, 'error': str(e)}
+            data = json.dumps(response, separators=(',', ':')).encode()
+            writer.write(len(data).to_bytes(4, 'big') + data)
+            await writer.drain()
+    finally:
+        writer.close()
+
+async def start_message_server(handler, socket_path: Optional[str] = None, host: str = '127.0.0.1', port: int = 8765):
+    """Listen for length-prefixed JSON requests on a Unix domain socket, or on TCP when no path is given"""
+    def client_connected(reader, writer):
+        return serve_messages(handler, reader, writer)
+    if socket_path:
+        server = await asyncio.start_unix_server(client_connected, path=socket_path)
+        print(f"Bridge server listening on {socket_path}", file=sys.stderr)
+    else:
+        server = await asyncio.start_server(client_connected, host, port)
+        print(f"Bridge server listening on {host}:{port}", file=sys.stderr)
+    return server
 
 def main():
-    """Main entry point - check for bridge mode"""
-    if len(sys.argv) > 1 and sys.argv[1] == '--bridge-mode':
+    """Main entry point - check for bridge or server mode"""
+    parser = argparse.ArgumentParser(description="Chain Reaction backend")
+    parser.add_argument('--bridge-mode', action='store_true', help="take commands on stdin and exchange state through the game state file")
+    parser.add_argument('--server', action='store_true', help="serve length-prefixed JSON requests on a socket")
+    parser.add_argument('--socket', help="Unix domain socket path for --server (default: localhost TCP)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sessions', action='store_true', help="with --server, host many games keyed by session id")
+    parser.add_argument('--workers', type=int, default=None, help="AI search processes for --sessions (default: CPU count)")
+    parser.add_argument('--max-sessions', type=int, default=256)
+    parser.add_argument('--idle-ttl', type=float, default=600.0, help="seconds before an idle session is evicted")
+    args = parser.parse_args()
+    
+    if args.server and args.sessions:
+        from game_service import GameService
+        service = GameService(args.workers, args.max_sessions, args.idle_ttl)
+        try:
+            asyncio.run(service.run_server(args.socket, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    elif args.server:
+        controller = BridgeGameController()
+        try:
+            asyncio.run(controller.run_server(args.socket, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    elif args.bridge_mode:
         controller = BridgeGameController()
         controller.run_bridge_mode()
     else:
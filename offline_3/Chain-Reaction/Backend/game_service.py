@@ -0,0 +1,239 @@
+import asyncio
+import os
+import secrets
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from bridge_mode import BridgeGameController, start_message_server
+from improved_chain_reaction import ChainReactionGame
+
+#Many concurrent games keyed by session id. Games live in the service process; AI searches go to a
+#bounded process pool. Each session queues its own requests in arrival order behind its lock, and only
+#the request at the head of a session's queue waits for a pool slot, so one busy session cannot crowd
+#out the others: slots are handed out first come first served across sessions.
+
+#latency samples kept per session for the metrics
+LATENCY_SAMPLES = 200
+
+#Per-process controllers holding each session's AIs, least recently used first, so a worker that
+#searches for a session again reuses that session's transposition table
+_worker_controllers = OrderedDict()
+_WORKER_SESSIONS = 256
+
+def _session_search(task: tuple) -> tuple:
+    """Choose one session's AI move in a worker process: (move, depth reached, search ms)"""
+    session_id, config, game = task
+    controller = _worker_controllers.pop(session_id, None) or BridgeGameController()
+    _worker_controllers[session_id] = controller
+    while len(_worker_controllers) > _WORKER_SESSIONS:
+        _, evicted = _worker_controllers.popitem(last=False)
+        evicted.close_ais()
+    ai = controller.get_ai(game.current_player, config)
+    start = time.perf_counter()
+    move = ai.get_best_move(game)
+    return move, getattr(ai, 'depth_reached', None), (time.perf_counter() - start) * 1000
+
+def _summary(values) -> dict:
+    """Count, mean, median, 95th percentile and max of a list of millisecond samples"""
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+    return {'count': len(ordered), 'mean': round(sum(ordered) / len(ordered), 2),
+            'p50': round(ordered[len(ordered) // 2], 2), 'p95': round(ordered[int(len(ordered) * 0.95)], 2),
+            'max': round(ordered[-1], 2)}
+
+class GameSession:
+    """One game with its config; its lock queues the session's requests in arrival order"""
+
+    def __init__(self, session_id: str, config: dict):
+        self.session_id = session_id
+        self.config = config
+        self.game = ChainReactionGame(int(config.get('rows', 9)), int(config.get('cols', 6)))
+        self.lock = asyncio.Lock()
+        self.pending = 0
+        self.created = self.last_used = time.monotonic()
+        self.moves = 0
+        #per AI move: time queued behind the session and the pool, search time, and the whole request
+        self.queue_ms = deque(maxlen=LATENCY_SAMPLES)
+        self.search_ms = deque(maxlen=LATENCY_SAMPLES)
+        self.total_ms = deque(maxlen=LATENCY_SAMPLES)
+
+    def metrics(self) -> dict:
+        return {'session': self.session_id, 'moves': self.moves, 'pending': self.pending,
+                'idleSeconds': round(time.monotonic() - self.last_used, 1),
+                'queueMs': _summary(self.queue_ms), 'searchMs': _summary(self.search_ms),
+                'totalMs': _summary(self.total_ms)}
+
+class GameService:
+    """Session-keyed games with AI searches on a bounded process pool, evicted by LRU and idle TTL"""
+
+    def __init__(self, workers: Optional[int] = None, max_sessions: int = 256, idle_ttl: float = 600.0,
+                 max_pending: int = 4):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        #AI requests a session may have queued before further ones are refused
+        self.max_pending = max_pending
+        #least recently used first
+        self.sessions = OrderedDict()
+        self.evictions = {'lru': 0, 'ttl': 0}
+        self.in_flight = 0
+        self._slots = asyncio.Semaphore(self.workers)
+        self._pool = None
+
+    def create_session(self, config: dict) -> GameSession:
+        """Start a game, evicting idle sessions first and the least recently used one when full"""
+        self.evict_idle()
+        if len(self.sessions) >= self.max_sessions:
+            victim = next((session for session in self.sessions.values() if session.pending == 0), None)
+            if victim is None:
+                raise RuntimeError(f"All {self.max_sessions} sessions are busy")
+            self.close_session(victim.session_id)
+            self.evictions['lru'] += 1
+        session = GameSession(secrets.token_hex(8), config)
+        self.sessions[session.session_id] = session
+        return session
+
+    def session(self, session_id: str) -> GameSession:
+        """Look up a session and mark it most recently used"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise KeyError(f"Unknown or expired session: {session_id}")
+        self.sessions.move_to_end(session_id)
+        session.last_used = time.monotonic()
+        return session
+
+    def close_session(self, session_id: str) -> bool:
+        return self.sessions.pop(session_id, None) is not None
+
+    def evict_idle(self) -> int:
+        """Drop sessions idle for longer than idle_ttl; returns how many"""
+        cutoff = time.monotonic() - self.idle_ttl
+        expired = [session.session_id for session in self.sessions.values()
+                   if session.last_used < cutoff and session.pending == 0]
+        for session_id in expired:
+            self.close_session(session_id)
+        self.evictions['ttl'] += len(expired)
+        return len(expired)
+
+    async def human_move(self, session_id: str, row: int, col: int, player: Optional[str] = None) -> tuple:
+        """Play a move for the current player: (session, explosion waves)"""
+        session = self.session(session_id)
+        async with session.lock:
+            game = session.game
+            current = game.current_player
+            if player is not None and player.upper() != current.value.upper():
+                raise ValueError(f"It's not {player.upper()}'s turn. Current player: {current.value.upper()}")
+            waves = []
+            if not game.make_move(row, col, current, waves=waves):
+                raise ValueError(f"Invalid move: {current.value} at ({row}, {col})")
+            session.moves += 1
+        return session, waves
+
+    async def ai_move(self, session_id: str) -> tuple:
+        """Search and play the current player's move: (session, move, depth reached, explosion waves)"""
+        session = self.session(session_id)
+        if session.pending >= self.max_pending:
+            raise RuntimeError(f"Session {session_id} already has {session.pending} AI moves queued")
+        start = time.perf_counter()
+        session.pending += 1
+        try:
+            async with session.lock:
+                game = session.game
+                if game.game_over:
+                    raise ValueError("Game is already over")
+                async with self._slots:
+                    queued = time.perf_counter()
+                    if self._pool is None:
+                        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                    self.in_flight += 1
+                    try:
+                        move, depth, search_ms = await asyncio.get_running_loop().run_in_executor(
+                            self._pool, _session_search, (session_id, session.config, game))
+                    finally:
+                        self.in_flight -= 1
+                waves = []
+                if not move or not game.make_move(move[0], move[1], game.current_player, waves=waves):
+                    raise ValueError(f"AI could not find a valid move for {game.current_player.value}")
+                session.moves += 1
+        finally:
+            session.pending -= 1
+        done = time.perf_counter()
+        session.queue_ms.append((queued - start) * 1000)
+        session.search_ms.append(search_ms)
+        session.total_ms.append((done - start) * 1000)
+        session.last_used = time.monotonic()
+        return session, move, depth, waves
+
+    def metrics(self, session_id: Optional[str] = None) -> dict:
+        """One session's latency metrics, or the service's with latencies pooled over all sessions"""
+        if session_id is not None:
+            return self.sessions[session_id].metrics() if session_id in self.sessions else {}
+        sessions = list(self.sessions.values())
+        return {'sessions': len(sessions), 'workers': self.workers, 'inFlight': self.in_flight,
+                'pending': sum(session.pending for session in sessions), 'evictions': dict(self.evictions),
+                'queueMs': _summary([value for session in sessions for value in session.queue_ms]),
+                'searchMs': _summary([value for session in sessions for value in session.search_ms]),
+                'totalMs': _summary([value for session in sessions for value in session.total_ms])}
+
+    async def handle_message(self, request: dict) -> dict:
+        """Server handler: init, human_move, ai_move, state, close and metrics requests keyed by session"""
+        op = request.get('op')
+        try:
+            if op == 'init':
+                session = self.create_session(request.get('config') or {})
+                return self._state_response(session)
+            if op == 'metrics':
+                return {'ok': True, 'metrics': self.metrics(request.get('session'))}
+            session_id = request.get('session')
+            if op == 'close':
+                return {'ok': self.close_session(session_id)}
+            if op == 'state':
+                return self._state_response(self.session(session_id))
+            if op == 'human_move':
+                session, waves = await self.human_move(session_id, int(request['row']), int(request['col']),
+                                                       request.get('player'))
+                return self._state_response(session, move=[int(request['row']), int(request['col'])],
+                                            waves=[wave.to_dict() for wave in waves])
+            if op == 'ai_move':
+                session, move, depth, waves = await self.ai_move(session_id)
+                return self._state_response(session, move=list(move), depth=depth,
+                                            searchMs=round(session.search_ms[-1], 1),
+                                            waves=[wave.to_dict() for wave in waves])
+            return {'ok': False, 'error': f"Unknown op: {op}"}
+        except (KeyError, ValueError, RuntimeError) as e:
+            return {'ok': False, 'error': str(e.args[0]) if e.args else str(e)}
+
+    @staticmethod
+    def _state_response(session: GameSession, **extra) -> dict:
+        state = session.game.snapshot(binary=False)
+        state.update(extra)
+        return {'ok': True, 'session': session.session_id, 'state': state}
+
+    async def _sweep(self):
+        """Evict idle sessions in the background, a few times per TTL"""
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_ttl / 4))
+            evicted = self.evict_idle()
+            if evicted:
+                print(f"Evicted {evicted} idle sessions", file=sys.stderr)
+
+    async def run_server(self, socket_path: Optional[str] = None, host: str = '127.0.0.1', port: int = 8765):
+        """Serve the session protocol on a Unix domain socket, or on TCP when no path is given"""
+        server = await start_message_server(self.handle_message, socket_path, host, port)
+        sweeper = asyncio.create_task(self._sweep())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+            self.shutdown()
+
+    def shutdown(self):
+        """Shut down the search pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
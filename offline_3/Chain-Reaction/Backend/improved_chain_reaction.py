@@ -1,8 +1,14 @@
 from typing import List, Tuple, Dict, Optional
 from enum import Enum
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from operator import xor
 import time
 import math
 import random
+import json
+import struct
 
 class Player(Enum):
     EMPTY = "Empty"
@@ -17,42 +23,200 @@ class GameMode(Enum):
 class AIType(Enum):
     SMART = "Smart AI (Minimax)"
     RANDOM = "Random AI"
+    MCTS = "MCTS AI (Monte Carlo Tree Search)"
+
+#Board cells are stored as signed orb counts: positive for Red, negative for Blue, 0 for empty
+def player_sign(player: Player) -> int:
+    #identity checks; hashing an Enum member for a dict lookup is much slower
+    return 1 if player is Player.RED else -1 if player is Player.BLUE else 0
+
+#Versioned state records (ChainReactionGame.snapshot / delta): the same fields either as fixed-layout
+#bytes or as a JSON-ready dict of integers. Bump STATE_VERSION whenever the layout changes.
+STATE_VERSION = 1
+STATE_MAGIC = b'\0CRS'
+SNAPSHOT, DELTA = 0, 1
+_STATE_KINDS = ('snapshot', 'delta')
+#magic, version, kind, rows, cols, current player sign, winner sign, game over, move count;
+#a snapshot follows it with one signed byte per cell
+_STATE_HEADER = struct.Struct('<4sBBBBbbBI')
+#a delta's base and resulting hashes and its number of changed cells, followed by
+#that many uint16 cell indexes and then their new signed values
+_DELTA_HEADER = struct.Struct('<QQH')
+_SIGN_PLAYERS = {1: Player.RED, -1: Player.BLUE}
+
+def _cell_str(value: int) -> str:
+    if value > 0:
+        return f"🔴{value}"
+    elif value < 0:
+        return f"🔵{-value}"
+    return "⚫"
+
+#Cell classes of BoardGeometry.cell_class, and what growth_potential_heuristic values each at
+CORNER, EDGE, CENTER = 0, 1, 2
+GROWTH_VALUES = {CORNER: 25, EDGE: 15, CENTER: 5}
+
+class BoardGeometry:
+    """Everything that depends only on the board size, as flat per-cell lists indexed like
+    ChainReactionGame.cells. Built once per (rows, cols) by board_geometry and shared by every
+    game of that size, their copies and the heuristics."""
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.positions = [(row, col) for row in range(rows) for col in range(cols)]
+        self.index_of = {position: index for index, position in enumerate(self.positions)}
+        self.neighbors = []
+        self.critical = []
+        self.cell_class = []
+        self.center_distance = []
+        center_row, center_col = rows // 2, cols // 2
+        for row, col in self.positions:
+            neighbors = []
+            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nr, nc = row + dr, col + dc
+                if 0 <= nr < rows and 0 <= nc < cols:
+                    neighbors.append(nr * cols + nc)
+            self.neighbors.append(tuple(neighbors))
+            #critical mass is the number of neighbors
+            self.critical.append(len(neighbors))
+            row_edge, col_edge = row in (0, rows - 1), col in (0, cols - 1)
+            self.cell_class.append(CORNER if row_edge and col_edge else EDGE if row_edge or col_edge else CENTER)
+            self.center_distance.append(abs(row - center_row) + abs(col - center_col))
+        self.critical_mass = dict(zip(self.positions, self.critical))
+
+        #Zobrist keys: zobrist[index][value] for every signed cell value. Each list has 256 entries
+        #so the int8 values -128..127 index it directly (negative values from the end); empty cells
+        #hash to 0, so an empty board's hash is 0
+        rng = random.Random(f"zobrist {rows}x{cols}")
+        self.zobrist = []
+        for _ in self.positions:
+            cell_keys = [rng.getrandbits(64) for _ in range(256)]
+            cell_keys[0] = 0
+            self.zobrist.append(cell_keys)
+
+        #position-only terms of strategic_control_heuristic and growth_potential_heuristic
+        chokes = {(0, 1), (1, 0), (0, cols-2), (1, cols-1),
+                  (rows-2, 0), (rows-1, 1), (rows-2, cols-1), (rows-1, cols-2)}
+        self.strategic_own = []
+        self.strategic_opponent = []
+        for position, dist_to_center in zip(self.positions, self.center_distance):
+            center_bonus = max(0, 20 - 2 * (dist_to_center ** 1.5))
+            self.strategic_own.append(center_bonus + (30 if position in chokes else 0))
+            self.strategic_opponent.append(max(0, 15 - 2 * (dist_to_center ** 1.5)))
+        self.growth_values = [GROWTH_VALUES[cell_class] for cell_class in self.cell_class]
+
+_geometries = {}
+
+def board_geometry(rows: int, cols: int) -> BoardGeometry:
+    """The shared BoardGeometry for a board size"""
+    key = (rows, cols)
+    if key not in _geometries:
+        _geometries[key] = BoardGeometry(rows, cols)
+    return _geometries[key]
+
+#mixed into the board hash when Blue is to move
+ZOBRIST_BLUE_TO_MOVE = random.Random("zobrist side").getrandbits(64)
 
 class Cell:
-    def __init__(self):
-        self.orbs = 0
-        self.player = Player.EMPTY
-    
+    """View of one board cell, reading and writing its game's flat cell array"""
+    __slots__ = ('_game', '_index', '_value')
+
+    def __init__(self, game: 'ChainReactionGame' = None, index: int = 0):
+        #a Cell created on its own keeps its value locally
+        self._game = game
+        self._index = index
+        self._value = 0
+
+    def _get(self) -> int:
+        return self._game.cells[self._index] if self._game is not None else self._value
+
+    def _set(self, value: int):
+        if self._game is not None:
+            self._game._set_index(self._index, value)
+        else:
+            self._value = value
+
+    @property
+    def orbs(self) -> int:
+        return abs(self._get())
+
+    @orbs.setter
+    def orbs(self, orbs: int):
+        #keeps the current owner's sign; an empty cell is stored as Red until .player is set,
+        #so assign orbs before player (as the file loaders do)
+        self._set(-orbs if self._get() < 0 else orbs)
+
+    @property
+    def player(self) -> Player:
+        value = self._get()
+        if value > 0:
+            return Player.RED
+        elif value < 0:
+            return Player.BLUE
+        return Player.EMPTY
+
+    @player.setter
+    def player(self, player: Player):
+        self._set(player_sign(player) * abs(self._get()))
+
     def __str__(self):
-        if self.player == Player.EMPTY:
-            return "⚫"
-        elif self.player == Player.RED:
-            return f"🔴{self.orbs}" if self.orbs > 0 else "⚫"
-        else:  # BLUE
-            return f"🔵{self.orbs}" if self.orbs > 0 else "⚫"
+        return _cell_str(self._get())
+
+class ExplosionWave:
+    """One wave of a chain reaction: cells that exploded, every cell it wrote with its new value, orb totals after"""
+    __slots__ = ('exploded', 'changed', 'red_orbs', 'blue_orbs')
+
+    def __init__(self, exploded: List[int], changed: Dict[int, int], red_orbs: int, blue_orbs: int):
+        self.exploded = exploded
+        self.changed = changed
+        self.red_orbs = red_orbs
+        self.blue_orbs = blue_orbs
+
+    def to_dict(self) -> dict:
+        """JSON-ready form: flat cell indexes and signed values, as in state records"""
+        return {'exploded': self.exploded, 'changed': [[index, value] for index, value in self.changed.items()],
+                'red': self.red_orbs, 'blue': self.blue_orbs}
 
 class ChainReactionGame:
     def __init__(self, rows: int, cols: int):
         self.rows = rows
         self.cols = cols
-        self.board = [[Cell() for _ in range(cols)] for _ in range(rows)]
+        self.cells = array('b', bytes(rows * cols))
+        #running orb totals, kept in step with every write to cells
+        self.red_orbs = 0
+        self.blue_orbs = 0
+        #set when a cell is written at or above critical mass outside of make_move
+        self._unsettled = False
+        #Zobrist hash of the cells, kept in step with every write like the orb totals
+        self.hash = 0
         self.current_player = Player.RED
         self.game_over = False
         self.winner = None
         self.move_count = 0
-        self._initialize_critical_mass_cache()
+        #undo entries pushed by make_move(record_undo=True); _log collects (index, old value) during one move
+        self._undo = []
+        self._log = None
+        self._attach_geometry(board_geometry(rows, cols))
     
-    def _initialize_critical_mass_cache(self):
-        """Pre-calculate critical mass for each position"""
-        self.critical_mass_cache = {}
-        for row in range(self.rows):
-            for col in range(self.cols):
-                neighbors = 0
-                for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    nr, nc = row + dr, col + dc
-                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                        neighbors += 1
-                self.critical_mass_cache[(row, col)] = neighbors
+    def _attach_geometry(self, geometry: BoardGeometry):
+        """Point the instance at its size's shared geometry; the hot loops read these attributes"""
+        self.geometry = geometry
+        self.neighbors = geometry.neighbors
+        self.critical = geometry.critical
+        self.positions = geometry.positions
+        self.critical_mass_cache = geometry.critical_mass
+        self.zobrist = geometry.zobrist
+
+    @property
+    def board(self) -> List[List[Cell]]:
+        """Row-major grid of Cell views over the flat cell array, built on every access;
+        use cell() or set_cell() for single cells"""
+        cols = self.cols
+        return [[Cell(self, row * cols + col) for col in range(cols)] for row in range(self.rows)]
+    
+    def cell(self, row: int, col: int) -> Cell:
+        """View of one cell"""
+        return Cell(self, row * self.cols + col)
     
     def get_critical_mass(self, row: int, col: int) -> int:
         """Get critical mass for a position (number of neighbors)"""
@@ -63,82 +227,93 @@ class ChainReactionGame:
         if not (0 <= row < self.rows and 0 <= col < self.cols):
             return False
          
-        cell = self.board[row][col]
-        return cell.player == Player.EMPTY or cell.player == player
+        value = self.cells[row * self.cols + col]
+        return value == 0 or value * player_sign(player) > 0
     
     def get_valid_moves(self, player: Player) -> List[Tuple[int, int]]:
         """Get all valid moves for a player"""
-        moves = []
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if self.is_valid_move(row, col, player):
-                    moves.append((row, col))
-        return moves
+        sign = player_sign(player)
+        positions = self.positions
+        return [positions[i] for i, value in enumerate(self.cells) if value == 0 or value * sign > 0]
     
-    def make_move(self, row: int, col: int, player: Player) -> bool:
-        """Make a move and handle explosions"""
+    def make_move(self, row: int, col: int, player: Player, record_undo: bool = False,
+                  waves: Optional[List[ExplosionWave]] = None) -> bool:
+        """Make a move and handle explosions; with record_undo, unmake_move can take it back,
+        and a waves list collects an ExplosionWave per wave for animating the chain reaction"""
         if not self.is_valid_move(row, col, player) or self.game_over:
             return False
 
-        self.board[row][col].orbs += 1
-        self.board[row][col].player = player
+        index = row * self.cols + col
+        if record_undo:
+            self._log = log = [(index, self.cells[index])]
+            self._undo.append((log, self.hash, self.red_orbs, self.blue_orbs, self._unsettled,
+                               self.current_player, self.move_count, self.game_over, self.winner))
+        sign = player_sign(player)
+        value = self.cells[index]
+        self.cells[index] = new_value = (abs(value) + 1) * sign
+        self.hash ^= self.zobrist[index][value] ^ self.zobrist[index][new_value]
+        if sign > 0:
+            self.red_orbs += 1
+        else:
+            self.blue_orbs += 1
         self.move_count += 1
-        
-        self._handle_explosions()
+
+        self._handle_explosions(index, waves)
+        self._log = None
         self._check_win_condition()
         #switch player if game is not over
         if not self.game_over:
             self.current_player = Player.BLUE if self.current_player == Player.RED else Player.RED
         return True
-    
-    def _handle_explosions(self):
+
+    def unmake_move(self):
+        """Take back the last move made with record_undo=True"""
+        log, self.hash, self.red_orbs, self.blue_orbs, self._unsettled, self.current_player, \
+            self.move_count, self.game_over, self.winner = self._undo.pop()
+        cells = self.cells
+        #newest first, so a cell written several times ends at its value from before the move
+        for index, value in reversed(log):
+            cells[index] = value
+
+    def _handle_explosions(self, start: Optional[int] = None, waves: Optional[List[ExplosionWave]] = None):
         """Handle chain explosions with game-over checking to prevent infinite loops"""
-        explosion_occurred = True
+        cells, critical, neighbors = self.cells, self.critical, self.neighbors
         iteration_count = 0
         max_iterations = 1000000  # Safety limit
-        
-        while explosion_occurred and iteration_count < max_iterations:
-            explosion_occurred = False
+
+        #only cells touched by the previous wave can reach critical mass in the next one,
+        #so each wave is built from those and sorted back into row-major explosion order
+        if start is None or self._unsettled:
+            exploding_cells = [i for i, value in enumerate(cells) if value >= critical[i] or -value >= critical[i]]
+            self._unsettled = False
+        else:
+            value = cells[start]
+            exploding_cells = [start] if value >= critical[start] or -value >= critical[start] else []
+
+        while exploding_cells and iteration_count < max_iterations:
             iteration_count += 1
-            
-            #all cells that need to explode
-            exploding_cells = []
-            for row in range(self.rows):
-                for col in range(self.cols):
-                    cell = self.board[row][col]
-                    critical_mass = self.get_critical_mass(row, col)
-                    if cell.orbs >= critical_mass and cell.player != Player.EMPTY:
-                        exploding_cells.append((row, col))
-            
-            if exploding_cells:
-                explosion_occurred = True  
-                
-                # Process explosions with small delay for visual effect
-                # print(f"💥 Processing {len(exploding_cells)} explosions...")
-                
-                if hasattr(self, 'interactive_mode') and self.interactive_mode:
-                    time.sleep(0.1)  #Very small delay for explosion visualization
-                
-                for row, col in exploding_cells:
-                    self._explode_cell(row, col)
-                if self._is_game_over_during_explosions():
-                    break
-        
+
+            touched = set(exploding_cells)
+            for index in exploding_cells:
+                self._explode_index(index)
+                touched.update(neighbors[index])
+            if waves is not None:
+                #the engine never waits on the animation; callers replay the waves at their own pace
+                waves.append(ExplosionWave(exploding_cells, {i: cells[i] for i in sorted(touched)},
+                                           self.red_orbs, self.blue_orbs))
+            if self._is_game_over_during_explosions():
+                #cells may be left at critical mass; a later make_move rescans the board
+                self._unsettled = True
+                break
+            exploding_cells = sorted(i for i in touched if cells[i] >= critical[i] or -cells[i] >= critical[i])
+
         if iteration_count >= max_iterations:
+            self._unsettled = True
             print(f"⚠️  Explosion loop terminated after {max_iterations} iterations for safety")
     
     def _is_game_over_during_explosions(self) -> bool:
         """Check if game is over during explosion processing"""
-        red_orbs = 0
-        blue_orbs = 0
-        
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.board[row][col]
-                if cell.player == Player.RED:
-                    red_orbs += cell.orbs
-                elif cell.player == Player.BLUE:
-                    blue_orbs += cell.orbs
+        red_orbs, blue_orbs = self._orb_totals()
         
         total_orbs = red_orbs + blue_orbs
         if total_orbs > 0 and self.move_count > 2:
@@ -146,37 +321,46 @@ class ChainReactionGame:
         
         return False
     
+    def _orb_totals(self) -> Tuple[int, int]:
+        """Red and blue orb totals"""
+        return self.red_orbs, self.blue_orbs
+
     def _explode_cell(self, row: int, col: int):
         """Explode a single cell"""
-        cell = self.board[row][col]
-        exploding_player = cell.player
-        critical_mass = self.get_critical_mass(row, col)
-        orbs_to_distribute = critical_mass
-        cell.orbs -= orbs_to_distribute
-        if cell.orbs <= 0:
-            cell.orbs = 0
-            cell.player = Player.EMPTY
+        self._explode_index(row * self.cols + col)
     
-        neighbors = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        for dr, dc in neighbors:
-            nr, nc = row + dr, col + dc
-            if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                neighbor_cell = self.board[nr][nc]
-                neighbor_cell.orbs += 1
-                neighbor_cell.player = exploding_player
+    def _explode_index(self, index: int):
+        """Explode the cell at a flat index"""
+        cells = self.cells
+        if self._log is not None:
+            self._log.append((index, cells[index]))
+            self._log.extend((neighbor, cells[neighbor]) for neighbor in self.neighbors[index])
+        zobrist = self.zobrist
+        value = cells[index]
+        sign = 1 if value > 0 else -1
+        remaining = abs(value) - self.critical[index]
+        cells[index] = new_value = remaining * sign if remaining > 0 else 0
+        board_hash = self.hash ^ zobrist[index][value] ^ zobrist[index][new_value]
+        #the exploding player's orbs only move; what changes hands is the neighbors' orbs it captures
+        captured = 0
+        for neighbor in self.neighbors[index]:
+            value = cells[neighbor]
+            if value * sign < 0:
+                captured += abs(value)
+            cells[neighbor] = new_value = (abs(value) + 1) * sign
+            board_hash ^= zobrist[neighbor][value] ^ zobrist[neighbor][new_value]
+        self.hash = board_hash
+        if captured:
+            if sign > 0:
+                self.red_orbs += captured
+                self.blue_orbs -= captured
+            else:
+                self.blue_orbs += captured
+                self.red_orbs -= captured
     
     def _check_win_condition(self):
         """Check if game is over and determine winner"""
-        red_orbs = 0
-        blue_orbs = 0
-        
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.board[row][col]
-                if cell.player == Player.RED:
-                    red_orbs += cell.orbs
-                elif cell.player == Player.BLUE:
-                    blue_orbs += cell.orbs
+        red_orbs, blue_orbs = self._orb_totals()
         
         total_orbs = red_orbs + blue_orbs
 
@@ -190,38 +374,81 @@ class ChainReactionGame:
     
     def get_score(self) -> Dict[Player, int]:
         """Get current score for each player"""
-        scores = {Player.RED: 0, Player.BLUE: 0}
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.board[row][col]
-                if cell.player in scores:
-                    scores[cell.player] += cell.orbs
-        return scores
+        red_orbs, blue_orbs = self._orb_totals()
+        return {Player.RED: red_orbs, Player.BLUE: blue_orbs}
+
+    def set_cell(self, row: int, col: int, orbs: int, player: Player):
+        """Set a cell's orb count and owner in one step"""
+        self._set_index(row * self.cols + col, player_sign(player) * orbs)
+
+    def _set_index(self, index: int, value: int):
+        """Write a signed cell value, keeping the orb totals in step"""
+        old = self.cells[index]
+        if old > 0:
+            self.red_orbs -= old
+        elif old < 0:
+            self.blue_orbs += old
+        if value > 0:
+            self.red_orbs += value
+        elif value < 0:
+            self.blue_orbs -= value
+        self.cells[index] = value
+        self.hash ^= self.zobrist[index][old] ^ self.zobrist[index][value]
+        if abs(value) >= self.critical[index]:
+            #the next make_move scans the whole board instead of starting from its own cell
+            self._unsettled = True
     
     def display_board(self):
         """Display the current board state"""
         print("\nCurrent Board:")
         for row in range(self.rows):
-            print(' '.join(str(self.board[row][col]) for col in range(self.cols)))
+            print(self._row_str(row))
         
         scores = self.get_score()
         print(f"\nScores - Red: {scores[Player.RED]}, Blue: {scores[Player.BLUE]}")
         print(f"Current Player: {self.current_player.value}")
     
+    def compute_hash(self) -> int:
+        """Zobrist hash of the cells from scratch (self.hash holds the same value incrementally)"""
+        #negative (Blue) values index each key list from the end, as in the incremental updates
+        return reduce(xor, map(list.__getitem__, self.zobrist, self.cells), 0)
+
+    def _row_str(self, row: int) -> str:
+        start = row * self.cols
+        return ' '.join(_cell_str(value) for value in self.cells[start:start + self.cols])
+
     def copy(self):
         """Create a deep copy of the game state"""
-        new_game = ChainReactionGame(self.rows, self.cols)
+        new_game = ChainReactionGame.__new__(ChainReactionGame)
+        new_game.rows = self.rows
+        new_game.cols = self.cols
+        new_game.cells = self.cells[:]
+        new_game.red_orbs = self.red_orbs
+        new_game.blue_orbs = self.blue_orbs
+        new_game._unsettled = self._unsettled
+        new_game.hash = self.hash
         new_game.current_player = self.current_player
         new_game.game_over = self.game_over
         new_game.winner = self.winner
         new_game.move_count = self.move_count
-        
-        for row in range(self.rows):
-            for col in range(self.cols):
-                new_game.board[row][col].orbs = self.board[row][col].orbs
-                new_game.board[row][col].player = self.board[row][col].player
+        new_game._undo = []
+        new_game._log = None
+        new_game._attach_geometry(self.geometry)
         
         return new_game
+
+    def __getstate__(self):
+        """Pickle only the position; the geometry is looked up again from the board size"""
+        state = self.__dict__.copy()
+        for name in ('geometry', 'zobrist', 'neighbors', 'critical', 'positions', 'critical_mass_cache', '_undo', '_log'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._undo = []
+        self._log = None
+        self._attach_geometry(board_geometry(self.rows, self.cols))
     
     def to_file_format(self, move_type: str) -> str:
         """Convert board to file format with game state metadata"""
@@ -240,8 +467,7 @@ class ChainReactionGame:
             lines.append(f"Winner: {self.winner.value}")
         lines.append("Board:")
         for row in range(self.rows):
-            line = ' '.join(str(self.board[row][col]) for col in range(self.cols))
-            lines.append(line)
+            lines.append(self._row_str(row))
         return '\n'.join(lines)
     
     def save_to_file(self, filename: str, move_type: str):
@@ -251,88 +477,230 @@ class ChainReactionGame:
     
     @classmethod
     def load_from_file(cls, filename: str) -> 'ChainReactionGame':
-        """Load game state from file with metadata"""
+        """Load game state from file: a binary or JSON state record, or the legacy text format"""
         try:
-            with open(filename, 'r') as f:
-                content = f.read().strip()
-            
-            lines = content.split('\n')
-            if not lines:
-                raise ValueError("Empty file")
-            header = lines[0]
-            metadata = {}
-            board_start_idx = 1
-            
-            for i, line in enumerate(lines[1:], 1):
-                if line.startswith("LastPlayer:"):
-                    metadata['last_player'] = line.split(": ", 1)[1]
-                elif line.startswith("MoveCount:"):
-                    metadata['move_count'] = int(line.split(": ", 1)[1])
-                elif line.startswith("GameOver:"):
-                    metadata['game_over'] = line.split(": ", 1)[1].lower() == 'true'
-                elif line.startswith("Winner:"):
-                    metadata['winner'] = line.split(": ", 1)[1]
-                elif line.startswith("Board:"):
-                    board_start_idx = i + 1
-                    break
-                elif line and not line.startswith(("LastPlayer:", "MoveCount:", "GameOver:", "Winner:", "Board:")):
-                    board_start_idx = i
-                    break
-            
-            board_lines = lines[board_start_idx:]
-            
-            if not board_lines:
-                raise ValueError("No board data found")
-            
-            first_line_cells = board_lines[0].split()
-            cols = len(first_line_cells)
-            rows = len(board_lines)   
-            #new game instance
-            game = cls(rows, cols)
-            #Parse board state
-            for row_idx, line in enumerate(board_lines):
-                cells = line.split()
-                if len(cells) != cols:
-                    raise ValueError(f"Inconsistent column count in row {row_idx}")
-                
-                for col_idx, cell_str in enumerate(cells):
-                    if cell_str == "⚫":
-                        game.board[row_idx][col_idx].orbs = 0
-                        game.board[row_idx][col_idx].player = Player.EMPTY
-                    elif cell_str.startswith("🔴"):
-                        orbs = int(cell_str[1:]) if len(cell_str) > 1 else 1
-                        game.board[row_idx][col_idx].orbs = orbs
-                        game.board[row_idx][col_idx].player = Player.RED
-                    elif cell_str.startswith("🔵"):
-                        orbs = int(cell_str[1:]) if len(cell_str) > 1 else 1
-                        game.board[row_idx][col_idx].orbs = orbs
-                        game.board[row_idx][col_idx].player = Player.BLUE
-                    else:
-                        if cell_str == "0":
-                            game.board[row_idx][col_idx].orbs = 0
-                            game.board[row_idx][col_idx].player = Player.EMPTY
-                        elif cell_str.endswith('R'):
-                            orbs = int(cell_str[:-1])
-                            game.board[row_idx][col_idx].orbs = orbs
-                            game.board[row_idx][col_idx].player = Player.RED
-                        elif cell_str.endswith('B'):
-                            orbs = int(cell_str[:-1])
-                            game.board[row_idx][col_idx].orbs = orbs
-                            game.board[row_idx][col_idx].player = Player.BLUE
-                        else:
-                            raise ValueError(f"Invalid cell format: {cell_str}")
-            if metadata:
-                game._restore_game_state_from_metadata(metadata)
-            else:
-                game._restore_game_state_from_board()
-            
-            return game
+            with open(filename, 'rb') as f:
+                data = f.read()
+            if data.startswith(STATE_MAGIC):
+                return cls.from_state(data)
+            content = data.decode('utf-8').strip()
+            if content.startswith('{'):
+                return cls.from_state(json.loads(content))
+            return cls.from_text(content)
             
         except FileNotFoundError:
             raise FileNotFoundError(f"Game state file '{filename}' not found")
         except Exception as e:
             raise ValueError(f"Error loading game state: {str(e)}")
     
+    @classmethod
+    def from_text(cls, content: str) -> 'ChainReactionGame':
+        """Parse the legacy text format written by to_file_format"""
+        content = content.strip()
+        lines = content.split('\n')
+        if not lines:
+            raise ValueError("Empty file")
+        header = lines[0]
+        metadata = {}
+        board_start_idx = 1
+        
+        for i, line in enumerate(lines[1:], 1):
+            if line.startswith("LastPlayer:"):
+                metadata['last_player'] = line.split(": ", 1)[1]
+            elif line.startswith("MoveCount:"):
+                metadata['move_count'] = int(line.split(": ", 1)[1])
+            elif line.startswith("GameOver:"):
+                metadata['game_over'] = line.split(": ", 1)[1].lower() == 'true'
+            elif line.startswith("Winner:"):
+                metadata['winner'] = line.split(": ", 1)[1]
+            elif line.startswith("Board:"):
+                board_start_idx = i + 1
+                break
+            elif line and not line.startswith(("LastPlayer:", "MoveCount:", "GameOver:", "Winner:", "Board:")):
+                board_start_idx = i
+                break
+        
+        board_lines = lines[board_start_idx:]
+        
+        if not board_lines:
+            raise ValueError("No board data found")
+        
+        first_line_cells = board_lines[0].split()
+        cols = len(first_line_cells)
+        rows = len(board_lines)   
+        #new game instance
+        game = cls(rows, cols)
+        #Parse board state
+        for row_idx, line in enumerate(board_lines):
+            cells = line.split()
+            if len(cells) != cols:
+                raise ValueError(f"Inconsistent column count in row {row_idx}")
+        
+            for col_idx, cell_str in enumerate(cells):
+                if cell_str == "⚫":
+                    game.set_cell(row_idx, col_idx, 0, Player.EMPTY)
+                elif cell_str.startswith("🔴"):
+                    orbs = int(cell_str[1:]) if len(cell_str) > 1 else 1
+                    game.set_cell(row_idx, col_idx, orbs, Player.RED)
+                elif cell_str.startswith("🔵"):
+                    orbs = int(cell_str[1:]) if len(cell_str) > 1 else 1
+                    game.set_cell(row_idx, col_idx, orbs, Player.BLUE)
+                else:
+                    if cell_str == "0":
+                        game.set_cell(row_idx, col_idx, 0, Player.EMPTY)
+                    elif cell_str.endswith('R'):
+                        orbs = int(cell_str[:-1])
+                        game.set_cell(row_idx, col_idx, orbs, Player.RED)
+                    elif cell_str.endswith('B'):
+                        orbs = int(cell_str[:-1])
+                        game.set_cell(row_idx, col_idx, orbs, Player.BLUE)
+                    else:
+                        raise ValueError(f"Invalid cell format: {cell_str}")
+        if metadata:
+            game._restore_game_state_from_metadata(metadata)
+        else:
+            game._restore_game_state_from_board()
+        
+        return game
+    
+    def snapshot(self, binary: bool = True):
+        """Full state record: fixed-layout bytes, or a dict of integers ready for json.dumps"""
+        fields = (self.rows, self.cols, player_sign(self.current_player), player_sign(self.winner),
+                  int(self.game_over), self.move_count)
+        if binary:
+            return _STATE_HEADER.pack(STATE_MAGIC, STATE_VERSION, SNAPSHOT, *fields) + self.cells.tobytes()
+        record = self._state_dict(SNAPSHOT, fields)
+        record['cells'] = self.cells.tolist()
+        return record
+    
+    def delta(self, base: 'ChainReactionGame', binary: bool = True):
+        """State record of the cells that changed since base, an earlier position of the same board"""
+        if (base.rows, base.cols) != (self.rows, self.cols):
+            raise ValueError("Delta base has a different board size")
+        fields = (self.rows, self.cols, player_sign(self.current_player), player_sign(self.winner),
+                  int(self.game_over), self.move_count)
+        old = base.cells
+        indexes = array('H', [i for i, value in enumerate(self.cells) if value != old[i]])
+        values = array('b', [self.cells[i] for i in indexes])
+        if binary:
+            return (_STATE_HEADER.pack(STATE_MAGIC, STATE_VERSION, DELTA, *fields) +
+                    _DELTA_HEADER.pack(base.hash, self.hash, len(indexes)) + indexes.tobytes() + values.tobytes())
+        record = self._state_dict(DELTA, fields)
+        #hex strings: JavaScript numbers cannot hold 64-bit hashes
+        record.update(base=f"{base.hash:016x}", hash=f"{self.hash:016x}",
+                      indexes=indexes.tolist(), values=values.tolist())
+        return record
+    
+    @staticmethod
+    def _state_dict(kind: int, fields: tuple) -> dict:
+        rows, cols, current, winner, game_over, move_count = fields
+        return {'version': STATE_VERSION, 'kind': _STATE_KINDS[kind], 'rows': rows, 'cols': cols,
+                'current': current, 'winner': winner, 'gameOver': bool(game_over), 'moveCount': move_count}
+    
+    @staticmethod
+    def _parse_state(record) -> tuple:
+        """Header fields and payload of a binary or dict state record"""
+        if isinstance(record, dict):
+            if record.get('version') != STATE_VERSION:
+                raise ValueError(f"Unsupported state version: {record.get('version')}")
+            kind = _STATE_KINDS.index(record['kind'])
+            fields = (record['rows'], record['cols'], record['current'], record['winner'],
+                      record['gameOver'], record['moveCount'])
+            #cells and values must fit a signed byte and indexes an unsigned short, as in binary records
+            try:
+                if kind == SNAPSHOT:
+                    return kind, fields, (bytes(array('b', record['cells'])),)
+                return kind, fields, (int(record['base'], 16), int(record['hash'], 16),
+                                      array('H', record['indexes']), array('b', record['values']))
+            except (OverflowError, TypeError) as e:
+                raise ValueError(f"State record value out of range: {e}")
+        magic, version, kind, *fields = _STATE_HEADER.unpack_from(record)
+        if magic != STATE_MAGIC:
+            raise ValueError("Not a state record")
+        if version != STATE_VERSION:
+            raise ValueError(f"Unsupported state version: {version}")
+        offset = _STATE_HEADER.size
+        if kind == SNAPSHOT:
+            return kind, fields, (record[offset:],)
+        base_hash, new_hash, count = _DELTA_HEADER.unpack_from(record, offset)
+        offset += _DELTA_HEADER.size
+        indexes = array('H', record[offset:offset + 2 * count])
+        values = array('b', record[offset + 2 * count:offset + 3 * count])
+        return kind, fields, (base_hash, new_hash, indexes, values)
+    
+    def _apply_state_fields(self, fields: tuple):
+        rows, cols, current, winner, game_over, move_count = fields
+        if (rows, cols) != (self.rows, self.cols):
+            raise ValueError(f"State record is for a {rows}x{cols} board")
+        if current not in _SIGN_PLAYERS:
+            raise ValueError(f"Invalid current player in state record: {current}")
+        self.current_player = _SIGN_PLAYERS[current]
+        self.winner = _SIGN_PLAYERS.get(winner)
+        self.game_over = bool(game_over)
+        self.move_count = move_count
+    
+    @classmethod
+    def from_state(cls, record) -> 'ChainReactionGame':
+        """Game from a snapshot record, binary or dict"""
+        kind, fields, payload = cls._parse_state(record)
+        if kind != SNAPSHOT:
+            raise ValueError("A delta needs its base position; use apply_state")
+        rows, cols = fields[0], fields[1]
+        if not (isinstance(rows, int) and isinstance(cols, int)) or rows < 1 or cols < 1:
+            raise ValueError(f"State record has an invalid board size: {rows!r}x{cols!r}")
+        game = cls(rows, cols)
+        game._apply_parsed_state(kind, fields, payload)
+        return game
+    
+    def apply_state(self, record):
+        """Bring the game to a snapshot record, or forward by a delta record made against its current position"""
+        self._apply_parsed_state(*self._parse_state(record))
+    
+    def _apply_parsed_state(self, kind: int, fields: tuple, payload: tuple):
+        if kind == SNAPSHOT:
+            cells, = payload
+            if len(cells) != self.rows * self.cols:
+                raise ValueError("Snapshot cell count does not match the board")
+            self._apply_state_fields(fields)
+            self.cells = cells = array('b', cells)
+            #totals and hash are derived here rather than trusted from the record
+            total, magnitude = sum(cells), sum(map(abs, cells))
+            self.red_orbs = (magnitude + total) // 2
+            self.blue_orbs = (magnitude - total) // 2
+            self.hash = self.compute_hash()
+            #the next make_move scans for cells left at critical mass, as after set_cell
+            self._unsettled = True
+            return
+        base_hash, new_hash, indexes, values = payload
+        if base_hash != self.hash:
+            raise ValueError("Delta was made against a different position")
+        if len(indexes) != len(values):
+            raise ValueError("Delta has a different number of indexes and values")
+        #the resulting hash is worked out before anything is written, so a delta that fails
+        #its check leaves the game untouched
+        cells, zobrist = self.cells, self.zobrist
+        written = {}
+        result = self.hash
+        for index, value in zip(indexes, values):
+            if index >= len(cells):
+                raise ValueError(f"Delta cell index {index} is off the board")
+            result ^= zobrist[index][written.get(index, cells[index])] ^ zobrist[index][value]
+            written[index] = value
+        if result != new_hash:
+            raise ValueError("Position after the delta does not match its hash")
+        self._apply_state_fields(fields)
+        for index, value in written.items():
+            self._set_index(index, value)
+    
+    def save_state(self, filename: str, binary: bool = True):
+        """Save a snapshot record; load_from_file reads it back"""
+        record = self.snapshot(binary)
+        with open(filename, 'wb' if binary else 'w') as f:
+            if binary:
+                f.write(record)
+            else:
+                json.dump(record, f, separators=(',', ':'))
+    
     def _restore_game_state_from_metadata(self, metadata: dict):
         """Restore game state from metadata (preferred method)"""
         self.move_count = metadata.get('move_count', 0)
@@ -348,122 +716,87 @@ class ChainReactionGame:
     
     def _restore_game_state_from_board(self):
         """Restore game state properties from board data (fallback method)"""
-        red_orbs = 0
-        blue_orbs = 0
-        
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.board[row][col]
-                if cell.player == Player.RED:
-                    red_orbs += cell.orbs
-                elif cell.player == Player.BLUE:
-                    blue_orbs += cell.orbs
+        red_orbs, blue_orbs = self._orb_totals()
         
         self.move_count = red_orbs + blue_orbs
         self.current_player = Player.RED if self.move_count % 2 == 0 else Player.BLUE
         self._check_win_condition()
-        
+
 class ChainReactionHeuristics:
     @staticmethod
     def orb_count_heuristic(game: ChainReactionGame, player: Player) -> float:
         """Simple orb count difference"""
-        scores = game.get_score()
-        opponent = Player.BLUE if player == Player.RED else Player.RED
-        return scores[player] - scores[opponent]
+        red_orbs, blue_orbs = game._orb_totals()
+        return (red_orbs - blue_orbs) * player_sign(player)
     
     @staticmethod
     def explosion_potential_heuristic(game: ChainReactionGame, player: Player) -> float:
         """Evaluates potential chain reaction opportunities"""
         score = 0
-        opponent = Player.BLUE if player == Player.RED else Player.RED
+        sign = player_sign(player)
+        cells, critical_of, neighbors = game.cells, game.critical, game.neighbors
         
-        for row in range(game.rows):
-            for col in range(game.cols):
-                cell = game.board[row][col]
-                critical = game.get_critical_mass(row, col)
-                
-                if cell.player == player:
-                    if cell.orbs == critical - 1:
-                        score += 50
-                    neighbor_bonus = 0
-                    for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-                        nr, nc = row + dr, col + dc
-                        if 0 <= nr < game.rows and 0 <= nc < game.cols:
-                            neighbor = game.board[nr][nc]
-                            if neighbor.player == opponent and neighbor.orbs > 0:
-                                neighbor_bonus += 15  
-                            elif neighbor.player == player:
-                                neighbor_bonus += 5   
-                    score += neighbor_bonus * (cell.orbs / critical)
+        for i, value in enumerate(cells):
+            owned = value * sign
+            if owned > 0:
+                critical = critical_of[i]
+                if owned == critical - 1:
+                    score += 50
+                neighbor_bonus = 0
+                for j in neighbors[i]:
+                    neighbor = cells[j] * sign
+                    if neighbor < 0:
+                        neighbor_bonus += 15
+                    elif neighbor > 0:
+                        neighbor_bonus += 5
+                score += neighbor_bonus * (owned / critical)
                 
-                elif cell.player == opponent:
-                    if cell.orbs == critical - 1:
-                        score -= 60  
+            elif owned < 0:
+                if -owned == critical_of[i] - 1:
+                    score -= 60
         return score
 
     @staticmethod
     def strategic_control_heuristic(game: ChainReactionGame, player: Player) -> float:
         """Measures control of key board regions and choke points"""
         score = 0
-        opponent = Player.BLUE if player == Player.RED else Player.RED
-        center_row, center_col = game.rows // 2, game.cols // 2
+        sign = player_sign(player)
+        own, opponent = game.geometry.strategic_own, game.geometry.strategic_opponent
         
-        for row in range(game.rows):
-            for col in range(game.cols):
-                cell = game.board[row][col]
-                dist_to_center = abs(row - center_row) + abs(col - center_col)
-                
-                if cell.player == player:
-                    center_bonus = max(0, 20 - 2 * (dist_to_center ** 1.5))
-                    is_choke = False
-                    if (row == 0 and col == 1) or (row == 1 and col == 0) or \
-                       (row == 0 and col == game.cols-2) or (row == 1 and col == game.cols-1) or \
-                       (row == game.rows-2 and col == 0) or (row == game.rows-1 and col == 1) or \
-                       (row == game.rows-2 and col == game.cols-1) or (row == game.rows-1 and col == game.cols-2):
-                        is_choke = True
-                    
-                    score += center_bonus + (30 if is_choke else 0)
-                
-                elif cell.player == opponent:
-                    score -= max(0, 15 - 2 * (dist_to_center ** 1.5))
+        for i, value in enumerate(game.cells):
+            owned = value * sign
+            if owned > 0:
+                score += own[i]
+            elif owned < 0:
+                score -= opponent[i]
         return score
 
     @staticmethod
     def growth_potential_heuristic(game: ChainReactionGame, player: Player) -> float:
         """Evaluates safe expansion opportunities"""
         score = 0
-        opponent = Player.BLUE if player == Player.RED else Player.RED
+        sign = player_sign(player)
+        cells, critical, neighbors, positions = game.cells, game.critical, game.neighbors, game.positions
+        strategic_values, index_of = game.geometry.growth_values, game.geometry.index_of
+        #(row, col) tuples rather than flat indices keep the original set order, and so the float sum
         frontier_cells = set()
-        
-        for row in range(game.rows):
-            for col in range(game.cols):
-                if game.board[row][col].player == player:
-                    for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-                        nr, nc = row + dr, col + dc
-                        if 0 <= nr < game.rows and 0 <= nc < game.cols:
-                            if game.board[nr][nc].player == Player.EMPTY:
-                                frontier_cells.add((nr, nc))
-        
-        for row, col in frontier_cells:
+
+        for i, value in enumerate(cells):
+            if value * sign > 0:
+                for j in neighbors[i]:
+                    if cells[j] == 0:
+                        frontier_cells.add(positions[j])
+
+        for position in frontier_cells:
+            index = index_of[position]
             safety_score = 0
-            strategic_value = 0
-            
-            for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < game.rows and 0 <= nc < game.cols:
-                    neighbor = game.board[nr][nc]
-                    if neighbor.player == opponent:
-                        critical = game.get_critical_mass(nr, nc)
-                        safety_score -= (neighbor.orbs / critical) * 40
-            
-            if (row == 0 or row == game.rows-1) and (col == 0 or col == game.cols-1):
-                strategic_value = 25  # Corner
-            elif row == 0 or row == game.rows-1 or col == 0 or col == game.cols-1:
-                strategic_value = 15  # Edge
-            else:
-                strategic_value = 5   # Center
-            
-            score += max(0, strategic_value + safety_score)
+
+            for j in neighbors[index]:
+                neighbor = cells[j] * sign
+                if neighbor < 0:
+                    safety_score -= (-neighbor / critical[j]) * 40
+
+            score += max(0, strategic_values[index] + safety_score)
         
         return score
 
@@ -471,45 +804,40 @@ class ChainReactionHeuristics:
     def threat_analysis_heuristic(game: ChainReactionGame, player: Player) -> float:
         """Advanced threat detection and response evaluation"""
         score = 0
-        opponent = Player.BLUE if player == Player.RED else Player.RED
+        sign = player_sign(player)
+        cells, critical_of, neighbors = game.cells, game.critical, game.neighbors
         immediate_threats = 0
         potential_threats = 0
         
-        for row in range(game.rows):
-            for col in range(game.cols):
-                cell = game.board[row][col]
-                critical = game.get_critical_mass(row, col)
+        for i, value in enumerate(cells):
+            owned = value * sign
+            if owned < 0:
+                orbs = -owned
+                critical = critical_of[i]
+                # Immediate threats (will explode next turn)
+                if orbs == critical - 1:
+                    immediate_threats += 1
+                    # Evaluating ability to block
+                    can_block = False
+                    for j in neighbors[i]:
+                        if cells[j] * sign > 0:
+                            can_block = True
+                            break
+                    score -= 50 if not can_block else 25
                 
-                if cell.player == opponent:
-                    # Immediate threats (will explode next turn)
-                    if cell.orbs == critical - 1:
-                        immediate_threats += 1
-                        # Evaluating ability to block
-                        can_block = False
-                        for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-                            nr, nc = row + dr, col + dc
-                            if 0 <= nr < game.rows and 0 <= nc < game.cols:
-                                if game.board[nr][nc].player == player:
-                                    can_block = True
-                                    break
-                        score -= 50 if not can_block else 25
+                # Potential threats (could explode soon)
+                elif orbs >= critical * 0.7:
+                    potential_threats += 1
+                    score -= 20 * (orbs / critical)
                     
-                    # Potential threats (could explode soon)
-                    elif cell.orbs >= critical * 0.7:
-                        potential_threats += 1
-                        score -= 20 * (cell.orbs / critical)
-                
-                elif cell.player == player:
-                    #defensive formations
-                    if cell.orbs > 0:
-                        defensive_strength = 0
-                        for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-                            nr, nc = row + dr, col + dc
-                            if 0 <= nr < game.rows and 0 <= nc < game.cols:
-                                neighbor = game.board[nr][nc]
-                                if neighbor.player == player:
-                                    defensive_strength += neighbor.orbs
-                        score += min(30, defensive_strength * 2)
+            elif owned > 0:
+                #defensive formations
+                defensive_strength = 0
+                for j in neighbors[i]:
+                    neighbor = cells[j] * sign
+                    if neighbor > 0:
+                        defensive_strength += neighbor
+                score += min(30, defensive_strength * 2)
         
         #Global threat assessment
         threat_ratio = (immediate_threats * 3 + potential_threats) / max(1, game.rows * game.cols)
@@ -521,24 +849,26 @@ class ChainReactionHeuristics:
     def tempo_heuristic(game: ChainReactionGame, player: Player) -> float:
         """Measures initiative and turn advantage"""
         score = 0
-        opponent = Player.BLUE if player == Player.RED else Player.RED
+        sign = player_sign(player)
+        critical = game.critical
         
         player_forcing_moves = 0
         opponent_forcing_moves = 0
+        #evaluate board development
+        player_development = 0
+        opponent_development = 0
         
-        for row in range(game.rows):
-            for col in range(game.cols):
-                cell = game.board[row][col]
-                critical = game.get_critical_mass(row, col)
-                
-                if cell.player == player and cell.orbs == critical - 2:
+        for i, value in enumerate(game.cells):
+            owned = value * sign
+            if owned > 0:
+                player_development += owned
+                if owned == critical[i] - 2:
                     player_forcing_moves += 1
-                elif cell.player == opponent and cell.orbs == critical - 2:
+            elif owned < 0:
+                opponent_development -= owned
+                if -owned == critical[i] - 2:
                     opponent_forcing_moves += 1
         
-        #evaluate board development
-        player_development = sum(cell.orbs for row in game.board for cell in row if cell.player == player)
-        opponent_development = sum(cell.orbs for row in game.board for cell in row if cell.player == opponent)
         development_ratio = player_development / max(1, opponent_development)
         
         #calculate tempo score
@@ -581,19 +911,105 @@ class ChainReactionHeuristics:
                 'orb_count': 0.2
             }
         
-        #weighted sum
+        #weighted sum; terms without a weight in this phase add 0 and are not evaluated
         score = 0
-        score += weights.get('explosion', 0) * ChainReactionHeuristics.explosion_potential_heuristic(game, player)
-        score += weights.get('strategic_control', 0) * ChainReactionHeuristics.strategic_control_heuristic(game, player)
-        score += weights.get('growth_potential', 0) * ChainReactionHeuristics.growth_potential_heuristic(game, player)
-        score += weights.get('threat', 0) * ChainReactionHeuristics.threat_analysis_heuristic(game, player)
-        score += weights.get('tempo', 0) * ChainReactionHeuristics.tempo_heuristic(game, player)
-        score += weights.get('orb_count', 0) * ChainReactionHeuristics.orb_count_heuristic(game, player)
+        for name, heuristic in (('explosion', ChainReactionHeuristics.explosion_potential_heuristic),
+                                ('strategic_control', ChainReactionHeuristics.strategic_control_heuristic),
+                                ('growth_potential', ChainReactionHeuristics.growth_potential_heuristic),
+                                ('threat', ChainReactionHeuristics.threat_analysis_heuristic),
+                                ('tempo', ChainReactionHeuristics.tempo_heuristic),
+                                ('orb_count', ChainReactionHeuristics.orb_count_heuristic)):
+            if name in weights:
+                score += weights[name] * heuristic(game, player)
         
         return score
 
+
+#Transposition table bound flags: the stored score is exact, or only a lower/upper bound
+#because an alpha-beta cutoff stopped the search of that position early
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class TranspositionTable:
+    """Fixed-size two-tier transposition table indexed by the low bits of the Zobrist key.
+
+    Each slot has a depth-preferred entry, replaced only by a search at least as deep or by
+    any search once the entry is from an earlier move, and an always-replace entry that takes
+    everything else. Entries are (key, depth, flag, score, move, age) tuples."""
+
+    def __init__(self, size: int = 1 << 16):
+        if size <= 0 or size & (size - 1):
+            raise ValueError("Transposition table size must be a power of two")
+        self.size = size
+        self.mask = size - 1
+        self.age = 0
+        self.deep = [None] * size
+        self.recent = [None] * size
+
+    def probe(self, key: int) -> Optional[tuple]:
+        """Entry stored for this key, or None"""
+        slot = key & self.mask
+        entry = self.deep[slot]
+        if entry is not None and entry[0] == key:
+            return entry
+        entry = self.recent[slot]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score: float, move: Optional[Tuple[int, int]]):
+        slot = key & self.mask
+        entry = (key, depth, flag, score, move, self.age)
+        deep = self.deep[slot]
+        if deep is None or deep[0] == key or depth >= deep[1] or deep[5] != self.age:
+            self.deep[slot] = entry
+        else:
+            self.recent[slot] = entry
+
+    def new_search(self):
+        """Age existing entries so they give way to the next search's"""
+        self.age += 1
+
+    def clear(self):
+        self.deep = [None] * self.size
+        self.recent = [None] * self.size
+
+    def __len__(self):
+        return sum(entry is not None for entry in self.deep) + sum(entry is not None for entry in self.recent)
+
+#Per-process searchers for parallel root search, reused across tasks so each worker keeps its table
+_worker_ais = {}
+
+def _search_root_move(task: tuple) -> Tuple[float, int, int, bool]:
+    """Search one root move in a worker process: (score, nodes, table hits, completed)"""
+    (game, move, player, depth, alpha, heuristic_func, table_size, batch_leaves,
+     search_id, search_start_time, time_limit, max_nodes) = task
+    key = (player, heuristic_func, table_size, batch_leaves)
+    ai = _worker_ais.get(key)
+    if ai is None:
+        ai = _worker_ais[key] = MinimaxAI(player, depth, heuristic_func=heuristic_func, table_size=table_size,
+                                          batch_leaves=batch_leaves)
+        ai.search_id = None
+    if ai.search_id != search_id:
+        ai.search_id = search_id
+        ai.transposition_table.new_search()
+    ai.search_start_time = search_start_time
+    ai.time_limit = time_limit
+    ai.max_nodes = max_nodes
+    ai.nodes_evaluated = 0
+    ai.cache_hits = 0
+    game.make_move(move[0], move[1], player)
+    score, _ = ai.minimax_search(game, depth - 1, alpha, float('inf'), False)
+    return score, ai.nodes_evaluated, ai.cache_hits, not ai._out_of_budget()
+
 class MinimaxAI:
-    def __init__(self, player: Player, depth: int = 3, heuristic_func=None):
+    #batch_leaves: children searched one at a time before batching, and the first batch size; a NumPy
+    #call costs about as much as five loop evaluations, so smaller batches do not pay
+    SERIAL_LEAVES = 3
+    FIRST_LEAF_BATCH = 8
+
+    def __init__(self, player: Player, depth: int = 3, heuristic_func=None,
+                 table_size: int = 1 << 16, keep_table: bool = False, time_budget_ms: Optional[int] = None,
+                 workers: int = 1, batch_leaves: bool = False):
         self.player = player
         self.depth = depth
         self.heuristic_func = heuristic_func or ChainReactionHeuristics.orb_count_heuristic
@@ -601,34 +1017,73 @@ class MinimaxAI:
         self.nodes_pruned = 0
         self.total_moves_considered = 0
         self.cache_hits = 0
-        self.transposition_table = {}
+        self.transposition_table = TranspositionTable(table_size)
+        #keep_table carries the table over between moves of a game instead of clearing it
+        self.keep_table = keep_table
         self.max_nodes = 750000  # Conservative node limit
         self.search_start_time = 0
         self.max_search_time = 25.0  # Conservative time limit
+        #per-move budget for the iterative deepening in get_best_move; depth is then the deepest iteration tried
+        self.time_budget_ms = time_budget_ms
+        self.time_limit = self.max_search_time
+        self.depth_reached = 0
+        self.principal_variation = []
+        self._pv_moves = {}
+        #workers > 1 splits the root moves of each iteration over a process pool
+        self.workers = workers
+        self._pool = None
+        self._workers_cut_off = False
+        self._searches = 0
+        #batch_leaves scores the children of depth-1 nodes together in NumPy heuristic calls (see vectorized_heuristics)
+        self.batch_leaves = batch_leaves
+        if batch_leaves:
+            #imported here because vectorized_heuristics itself imports this module
+            from vectorized_heuristics import BATCHED, score_boards
+            if self.heuristic_func not in BATCHED:
+                name = getattr(self.heuristic_func, '__name__', repr(self.heuristic_func))
+                raise ValueError(f"batch_leaves needs a heuristic with a batched version in "
+                                 f"vectorized_heuristics.BATCHED; {name} has none")
+            self._score_boards = score_boards
 
-    def get_game_state_key(self, game: ChainReactionGame) -> tuple:
-        """Generate a hashable key for the game state"""
-        state = tuple((cell.orbs, cell.player.value) for row in game.board for cell in row)
-        return (state, game.current_player.value)
+    def get_game_state_key(self, game: ChainReactionGame) -> int:
+        """Zobrist key for the game state: the board hash plus the side to move"""
+        if game.current_player is Player.BLUE:
+            return game.hash ^ ZOBRIST_BLUE_TO_MOVE
+        return game.hash
+
+    def _out_of_budget(self) -> bool:
+        return (time.time() - self.search_start_time > self.time_limit or
+                self.nodes_evaluated > self.max_nodes or self._workers_cut_off)
 
     def minimax_search(self, game: ChainReactionGame, depth: int, 
                       alpha: float = float('-inf'), beta: float = float('inf'), 
                       maximizing: bool = True) -> Tuple[float, Optional[Tuple[int, int]]]:
         self.nodes_evaluated += 1
     
-        if (time.time() - self.search_start_time > self.max_search_time or 
-            self.nodes_evaluated > self.max_nodes):
+        if self._out_of_budget():
             return self.heuristic_func(game, self.player), None
         
         #state key for caching
         state_key = self.get_game_state_key(game)
+        table = self.transposition_table
+        alpha_original, beta_original = alpha, beta
         
-        #check transposition table
-        if state_key in self.transposition_table:
-            cached_score, cached_depth, cached_move = self.transposition_table[state_key]
+        #check transposition table; bounds only narrow the window, exact scores are returned
+        entry = table.probe(state_key)
+        table_move = None
+        if entry is not None:
+            _, cached_depth, cached_flag, cached_score, table_move, _ = entry
             if cached_depth >= depth:
-                self.cache_hits += 1
-                return cached_score, cached_move
+                if cached_flag == EXACT:
+                    self.cache_hits += 1
+                    return cached_score, table_move
+                if cached_flag == LOWER:
+                    alpha = max(alpha, cached_score)
+                else:
+                    beta = min(beta, cached_score)
+                if alpha >= beta:
+                    self.cache_hits += 1
+                    return cached_score, table_move
         
         #base cases: 
         if depth == 0 or game.game_over:
@@ -636,7 +1091,7 @@ class MinimaxAI:
                 score = 1000 if game.winner == self.player else (-1000 if game.winner is not None else 0)
             else:
                 score = self.heuristic_func(game, self.player)
-            self.transposition_table[state_key] = (score, depth, None)
+            table.store(state_key, depth, EXACT, score, None)
             return score, None
         
         current_player = self.player if maximizing else (Player.BLUE if self.player == Player.RED else Player.RED)
@@ -648,28 +1103,33 @@ class MinimaxAI:
                 score = -1000  
             else:
                 score = 1000   
-            self.transposition_table[state_key] = (score, depth, None)
+            table.store(state_key, depth, EXACT, score, None)
             return score, None
         
-        # Ordering moves for better pruning
+        # Ordering moves for better pruning, trying the previous iteration's principal variation
+        # and then the table's best move first
         valid_moves = self.order_moves(game, valid_moves)
+        first_move = self._pv_moves.get(state_key, table_move)
+        if first_move in valid_moves:
+            valid_moves.remove(first_move)
+            valid_moves.insert(0, first_move)
+        if self.batch_leaves and depth == 1:
+            return self._batched_frontier(game, state_key, valid_moves, current_player, alpha, beta, maximizing)
         best_move = None
         moves_evaluated = 0
-        
+
         if maximizing:
             max_eval = float('-inf')
             for move in valid_moves:
-                if (time.time() - self.search_start_time > self.max_search_time or 
-                    self.nodes_evaluated > self.max_nodes):
+                if self._out_of_budget():
                     break
-                    
+
                 self.total_moves_considered += 1
                 moves_evaluated += 1
-                game_copy = game.copy()
-                game_copy.make_move(move[0], move[1], current_player)
-                
-                eval_score, _ = self.minimax_search(game_copy, depth - 1, alpha, beta, False)
-                
+                game.make_move(move[0], move[1], current_player, record_undo=True)
+                eval_score, _ = self.minimax_search(game, depth - 1, alpha, beta, False)
+                game.unmake_move()
+
                 if eval_score > max_eval:
                     max_eval = eval_score
                     best_move = move
@@ -679,22 +1139,21 @@ class MinimaxAI:
                     self.nodes_pruned += len(valid_moves) - moves_evaluated
                     break
                     
-            self.transposition_table[state_key] = (max_eval, depth, best_move)
+            self._store(state_key, depth, max_eval, best_move, alpha_original, beta_original)
             return max_eval, best_move
         else:
             min_eval = float('inf')
             for move in valid_moves:
-                if (time.time() - self.search_start_time > self.max_search_time or 
-                    self.nodes_evaluated > self.max_nodes):
+                if self._out_of_budget():
                     break
-                    
+
                 self.total_moves_considered += 1
                 moves_evaluated += 1
                 
-                game_copy = game.copy()
-                game_copy.make_move(move[0], move[1], current_player)
-                eval_score, _ = self.minimax_search(game_copy, depth - 1, alpha, beta, True)
-                
+                game.make_move(move[0], move[1], current_player, record_undo=True)
+                eval_score, _ = self.minimax_search(game, depth - 1, alpha, beta, True)
+                game.unmake_move()
+
                 if eval_score < min_eval:
                     min_eval = eval_score
                     best_move = move
@@ -704,37 +1163,214 @@ class MinimaxAI:
                     self.nodes_pruned += len(valid_moves) - moves_evaluated
                     break
                     
-            self.transposition_table[state_key] = (min_eval, depth, best_move)
+            self._store(state_key, depth, min_eval, best_move, alpha_original, beta_original)
             return min_eval, best_move
 
+    def _child_scores(self, game: ChainReactionGame, moves: List[Tuple[int, int]], player: Player) -> List[float]:
+        """Static score of every child: finished games and table hits directly, the rest in one
+        batched heuristic call whose scores then go into the table like single leaf evaluations"""
+        table = self.transposition_table
+        scores = []
+        pending = []
+        keys = []
+        boards = []
+        move_counts = []
+        for i, move in enumerate(moves):
+            game.make_move(move[0], move[1], player, record_undo=True)
+            state_key = self.get_game_state_key(game)
+            entry = table.probe(state_key)
+            if entry is not None and entry[2] == EXACT:
+                self.cache_hits += 1
+                scores.append(entry[3])
+            elif game.game_over:
+                scores.append(1000 if game.winner == self.player else (-1000 if game.winner is not None else 0))
+            else:
+                scores.append(None)
+                pending.append(i)
+                keys.append(state_key)
+                boards.append(game.cells.tobytes())
+                move_counts.append(game.move_count)
+            game.unmake_move()
+        if pending:
+            batch = self._score_boards(self.heuristic_func, b''.join(boards), game.rows, game.cols,
+                                       self.player, move_counts)
+            for i, state_key, score in zip(pending, keys, batch.tolist()):
+                scores[i] = score
+                table.store(state_key, 0, EXACT, score, None)
+        return scores
+
+    def _batched_frontier(self, game: ChainReactionGame, state_key: int, moves: List[Tuple[int, int]],
+                          player: Player, alpha: float, beta: float,
+                          maximizing: bool) -> Tuple[float, Optional[Tuple[int, int]]]:
+        """Depth-1 node: the first few children are searched one by one, since a cutoff usually
+        comes early; the rest are scored in batches of 8, 16, 32, ... with the cutoff test after each"""
+        best = float('-inf') if maximizing else float('inf')
+        best_move = None
+        start = min(len(moves), self.SERIAL_LEAVES)
+        for index, move in enumerate(moves[:start]):
+            self.total_moves_considered += 1
+            game.make_move(move[0], move[1], player, record_undo=True)
+            score, _ = self.minimax_search(game, 0, alpha, beta, not maximizing)
+            game.unmake_move()
+            if score > best if maximizing else score < best:
+                best, best_move = score, move
+            if best >= beta if maximizing else best <= alpha:
+                start = index + 1
+                break
+        size = self.FIRST_LEAF_BATCH
+        while start < len(moves) and not (best >= beta if maximizing else best <= alpha):
+            if self._out_of_budget():
+                break
+            batch = moves[start:start + size]
+            self.nodes_evaluated += len(batch)
+            self.total_moves_considered += len(batch)
+            for move, score in zip(batch, self._child_scores(game, batch, player)):
+                if score > best if maximizing else score < best:
+                    best, best_move = score, move
+            start += size
+            size *= 2
+        self.nodes_pruned += len(moves) - start if start < len(moves) else 0
+        #flagged against the window this node was searched with
+        self._store(state_key, 1, best, best_move, alpha, beta)
+        return best, best_move
+
+    def _store(self, state_key: int, depth: int, score: float, best_move: Optional[Tuple[int, int]],
+               alpha: float, beta: float):
+        """Store a searched node with the bound its score gives against the original window"""
+        if self._out_of_budget():
+            #some child was cut off by the time or node budget, so the score proves nothing
+            return
+        if score <= alpha:
+            flag = UPPER
+        elif score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.transposition_table.store(state_key, depth, flag, score, best_move)
+
     def get_best_move(self, game: ChainReactionGame) -> Optional[Tuple[int, int]]:
         self.nodes_evaluated = 0
         self.nodes_pruned = 0
         self.total_moves_considered = 0
         self.cache_hits = 0
-        self.transposition_table.clear()
+        if self.keep_table:
+            self.transposition_table.new_search()
+        else:
+            self.transposition_table.clear()
         self.search_start_time = time.time()
+        self.time_limit = self.time_budget_ms / 1000 if self.time_budget_ms is not None else self.max_search_time
+        self.depth_reached = 0
+        self.principal_variation = []
+        self._pv_moves = {}
+        self._workers_cut_off = False
         
-        total_orbs = sum(cell.orbs for row in game.board for cell in row if cell.player != Player.EMPTY)
-        valid_moves_count = len(game.get_valid_moves(self.player))
-        print(f"🎯 AI searching at depth {self.depth} for {total_orbs} orbs, {valid_moves_count} valid moves")
-        
-        _, best_move = self.minimax_search(game, self.depth)
+        total_orbs = sum(game.get_score().values())
+        valid_moves = game.get_valid_moves(self.player)
+        print(f"🎯 AI searching up to depth {self.depth} for {total_orbs} orbs, {len(valid_moves)} valid moves")
         
+        #iterative deepening: an iteration cut off by the time or node budget is thrown away,
+        #so the move played always comes from the deepest fully searched depth
+        best_move = self.order_moves(game, valid_moves)[0] if valid_moves else None
+        self._searches += 1
+        for depth in range(1, self.depth + 1):
+            if self.workers > 1:
+                score, move = self._parallel_root_search(game, depth)
+            else:
+                #one private copy is searched in place with make_move/unmake_move
+                score, move = self.minimax_search(game.copy(), depth)
+            if self._out_of_budget():
+                break
+            best_move = move or best_move
+            self.depth_reached = depth
+            self._extract_principal_variation(game, depth)
+            if abs(score) >= 1000:
+                break  #forced win or loss; deeper search cannot change it
+            if time.time() - self.search_start_time > self.time_limit / 2:
+                break  #the next iteration would not finish in what is left
+
         search_time = time.time() - self.search_start_time
         pruning_rate = (self.nodes_pruned / max(self.total_moves_considered, 1)) * 100 if self.total_moves_considered > 0 else 0
         cache_hit_rate = (self.cache_hits / max(self.nodes_evaluated, 1)) * 100 if self.nodes_evaluated > 0 else 0
-        print(f"⚡ Search completed in {search_time:.2f}s with {self.nodes_evaluated:,} nodes, {self.nodes_pruned:,} pruned ({pruning_rate:.1f}% efficiency), {self.cache_hits:,} hits ({cache_hit_rate:.1f}% hit rate)")
+        print(f"⚡ Search completed in {search_time:.2f}s at depth {self.depth_reached} with {self.nodes_evaluated:,} nodes, {self.nodes_pruned:,} pruned ({pruning_rate:.1f}% efficiency), {self.cache_hits:,} hits ({cache_hit_rate:.1f}% hit rate)")
         return best_move
+
+    def _parallel_root_search(self, game: ChainReactionGame, depth: int) -> Tuple[float, Optional[Tuple[int, int]]]:
+        """Root search with the root moves split over the process pool.
+
+        The first move is searched here to get a score to beat; the rest go to the workers with
+        that score as alpha, and results are read back in move order, keeping the earliest of
+        equal scores. That picks the same move as the serial search at the same depth."""
+        self._workers_cut_off = False
+        moves = game.get_valid_moves(self.player)
+        if depth < 2 or len(moves) < 2 or game.game_over:
+            return self.minimax_search(game.copy(), depth)
+        self.nodes_evaluated += 1
+        state_key = self.get_game_state_key(game)
+        entry = self.transposition_table.probe(state_key)
+        moves = self.order_moves(game, moves)
+        first_move = self._pv_moves.get(state_key, entry[4] if entry is not None else None)
+        if first_move in moves:
+            moves.remove(first_move)
+            moves.insert(0, first_move)
+
+        child = game.copy()
+        child.make_move(moves[0][0], moves[0][1], self.player)
+        best_score, _ = self.minimax_search(child, depth - 1, float('-inf'), float('inf'), False)
+        best_move = moves[0]
+        if self._out_of_budget():
+            return best_score, best_move
+
+        #each worker task gets an equal share of the nodes left; all share the parent's clock
+        rest = moves[1:]
+        node_share = max(1, (self.max_nodes - self.nodes_evaluated) // len(rest))
+        template = game.copy()
+        tasks = [(template, move, self.player, depth, best_score, self.heuristic_func,
+                  self.transposition_table.size, self.batch_leaves, self._searches, self.search_start_time,
+                  self.time_limit, node_share) for move in rest]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        for move, (score, nodes, hits, completed) in zip(rest, self._pool.map(_search_root_move, tasks)):
+            self.nodes_evaluated += nodes
+            self.cache_hits += hits
+            self.total_moves_considered += 1
+            if not completed:
+                self._workers_cut_off = True
+            #a score at or below alpha is only an upper bound; it can never beat best_score
+            if score > best_score:
+                best_score, best_move = score, move
+        if not self._out_of_budget():
+            self.transposition_table.store(state_key, depth, EXACT, best_score, best_move)
+        return best_score, best_move
+
+    def close(self):
+        """Shut down the parallel search's process pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _extract_principal_variation(self, game: ChainReactionGame, depth: int):
+        """Follow the table's best moves from the root; the next iteration tries them first"""
+        game = game.copy()
+        self.principal_variation = []
+        self._pv_moves = {}
+        mover = self.player
+        for _ in range(depth):
+            state_key = self.get_game_state_key(game)
+            entry = self.transposition_table.probe(state_key)
+            if entry is None or entry[4] is None or not game.make_move(*entry[4], mover):
+                break
+            self.principal_variation.append(entry[4])
+            self._pv_moves[state_key] = entry[4]
+            mover = Player.BLUE if mover == Player.RED else Player.RED
     
     def order_moves(self, game: ChainReactionGame, moves: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
         """Order moves by proximity to critical mass for better pruning"""
+        cells, critical_of, cols = game.cells, game.critical, game.cols
         def move_score(move):
-            row, col = move
-            cell = game.board[row][col]
-            critical = game.get_critical_mass(row, col)
+            index = move[0] * cols + move[1]
+            critical = critical_of[index]
             if critical > 0:
-                return cell.orbs / critical
+                return abs(cells[index]) / critical
             return 0
         return sorted(moves, key=move_score, reverse=True)
 
@@ -753,6 +1389,148 @@ class RandomAI:
         print(f"🎲 Random AI selected move: {move[0]}, {move[1]}")
         return move
 
+class MCTSNode:
+    """MCTSAI search tree node; wins are counted for the player who made the move into it"""
+    __slots__ = ('move', 'parent', 'mover', 'key', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, game: ChainReactionGame, move: Optional[Tuple[int, int]], parent: Optional['MCTSNode'],
+                 mover: Optional[Player], rng: random.Random):
+        self.move = move
+        self.parent = parent
+        self.mover = mover
+        #position and side to move, for finding this node again when the tree is reused
+        self.key = (game.hash, game.current_player)
+        self.children = []
+        self.untried = [] if game.game_over else game.get_valid_moves(game.current_player)
+        rng.shuffle(self.untried)
+        self.visits = 0
+        self.wins = 0.0
+
+class MCTSAI:
+    """Monte Carlo Tree Search: UCT selection, random or heuristic-biased rollouts, tree reuse between moves"""
+    #rollouts stop after this many plies and score the position by Red's share of the orbs,
+    #since random games on large boards can run for hundreds of moves
+    ROLLOUT_PLIES = 60
+    #heuristic rollouts play the best of this many sampled moves by heuristic_func
+    ROLLOUT_CANDIDATES = 3
+
+    def __init__(self, player: Player, time_budget_ms: Optional[int] = 1000, max_playouts: Optional[int] = None,
+                 rollout: str = 'random', heuristic_func=None, exploration: float = 1.4, reuse_tree: bool = True,
+                 seed: Optional[int] = None):
+        if rollout not in ('random', 'heuristic'):
+            raise ValueError(f"Unknown rollout policy: {rollout}")
+        if time_budget_ms is None and max_playouts is None:
+            raise ValueError("MCTSAI needs a time budget or a playout limit")
+        self.player = player
+        self.time_budget_ms = time_budget_ms
+        self.max_playouts = max_playouts
+        self.rollout = rollout
+        self.heuristic_func = heuristic_func or ChainReactionHeuristics.orb_count_heuristic
+        self.exploration = exploration
+        self.reuse_tree = reuse_tree
+        self.rng = random.Random(seed)
+        #subtree of the last move played, searched again if the opponent's reply was expanded
+        self.root = None
+        self.playouts = 0
+        self.playouts_per_second = 0.0
+        self.reused_visits = 0
+
+    def get_best_move(self, game: ChainReactionGame) -> Optional[Tuple[int, int]]:
+        """Run playouts until the time budget or playout limit and play the most visited move"""
+        if not game.get_valid_moves(self.player):
+            return None
+        root = self._find_root(game)
+        self.reused_visits = root.visits
+        start_time = time.time()
+        deadline = start_time + self.time_budget_ms / 1000 if self.time_budget_ms is not None else math.inf
+        playouts = 0
+        #at least one playout, so the root always has a child to choose
+        while playouts == 0 or (time.time() < deadline and (self.max_playouts is None or playouts < self.max_playouts)):
+            self._playout(root, game)
+            playouts += 1
+        search_time = time.time() - start_time
+        self.playouts = playouts
+        self.playouts_per_second = playouts / search_time if search_time > 0 else 0.0
+
+        best = max(root.children, key=lambda child: child.visits)
+        print(f"🌲 MCTS ran {playouts:,} playouts in {search_time:.2f}s ({self.playouts_per_second:,.0f}/s, "
+              f"{self.reused_visits:,} reused); best move {best.move} won {best.wins / best.visits:.0%} of {best.visits:,} visits")
+        if self.reuse_tree:
+            best.parent = None
+            self.root = best
+        return best.move
+
+    def _find_root(self, game: ChainReactionGame) -> MCTSNode:
+        """The kept subtree's node for this position if there is one, else a new tree"""
+        key = (game.hash, game.current_player)
+        previous = self.root
+        self.root = None
+        if previous is not None:
+            for node in [previous] + previous.children:
+                if node.key == key:
+                    node.parent = None
+                    return node
+        return MCTSNode(game, None, None, None, self.rng)
+
+    def _playout(self, root: MCTSNode, game: ChainReactionGame):
+        """One selection, expansion, rollout and backpropagation pass"""
+        node = root
+        game = game.copy()
+        log = math.log
+        exploration = self.exploration
+        while not node.untried and node.children:
+            log_visits = log(node.visits)
+            node = max(node.children, key=lambda child: child.wins / child.visits +
+                       exploration * math.sqrt(log_visits / child.visits))
+            game.make_move(node.move[0], node.move[1], game.current_player)
+        if node.untried:
+            move = node.untried.pop()
+            mover = game.current_player
+            game.make_move(move[0], move[1], mover)
+            child = MCTSNode(game, move, node, mover, self.rng)
+            node.children.append(child)
+            node = child
+        red_share = self._rollout(game)
+        while node is not None:
+            node.visits += 1
+            node.wins += red_share if node.mover is Player.RED else 1 - red_share
+            node = node.parent
+
+    def _rollout(self, game: ChainReactionGame) -> float:
+        """Play the game on (in place) and return Red's result: 1 or 0 when decided, else its orb share"""
+        random_float = self.rng.random
+        cells, positions = game.cells, game.positions
+        size = len(cells)
+        heuristic = self.heuristic_func if self.rollout == 'heuristic' else None
+        candidates = self.ROLLOUT_CANDIDATES if heuristic is not None else 1
+        for _ in range(self.ROLLOUT_PLIES):
+            if game.game_over:
+                break
+            player = game.current_player
+            sign = 1 if player is Player.RED else -1
+            #rejection sampling is uniform over the playable cells and, with most of the board
+            #playable, takes a draw or two instead of a scan of every cell
+            sampled = []
+            while len(sampled) < candidates:
+                index = int(random_float() * size)
+                if cells[index] * sign >= 0:
+                    sampled.append(index)
+            if heuristic is not None:
+                best_score = -math.inf
+                for candidate in sampled:
+                    row, col = positions[candidate]
+                    game.make_move(row, col, player, record_undo=True)
+                    score = math.inf if game.game_over else heuristic(game, player)
+                    game.unmake_move()
+                    if score > best_score:
+                        best_score, index = score, candidate
+            row, col = positions[index]
+            game.make_move(row, col, player)
+        if game.game_over:
+            return 1.0 if game.winner is Player.RED else 0.0
+        total = game.red_orbs + game.blue_orbs
+        return game.red_orbs / total if total else 0.5
+
 class GameController:
     def __init__(self):
         self.game = None
@@ -822,16 +1600,19 @@ class GameController:
             print(f"\n{player_name} AI Type:")
             print("1 - Smart AI (Strategic Minimax)")
             print("2 - Random AI (Makes random moves)")
+            print("3 - MCTS AI (Monte Carlo Tree Search, 1 second per move)")
             
             while True:
                 try:
-                    choice = int(input(f"Select {player_name} AI type (1-2): "))
+                    choice = int(input(f"Select {player_name} AI type (1-3): "))
                     if choice == 1:
                         return AIType.SMART
                     elif choice == 2:
                         return AIType.RANDOM
+                    elif choice == 3:
+                        return AIType.MCTS
                     else:
-                        print("Invalid choice. Please enter 1 or 2.")
+                        print("Invalid choice. Please enter 1, 2 or 3.")
                 except ValueError:
                     print("Invalid input. Please enter a number.")
         
@@ -906,17 +1687,21 @@ class GameController:
         
         if red_ai_type == AIType.SMART:
             heuristic = red_heuristic or ChainReactionHeuristics.growth_potential_heuristic
-            self.ai_red = MinimaxAI(Player.RED, depth=depth, heuristic_func=heuristic)
+            self.ai_red = MinimaxAI(Player.RED, depth=depth, heuristic_func=heuristic, keep_table=True)
         elif red_ai_type == AIType.RANDOM:
             self.ai_red = RandomAI(Player.RED)
+        elif red_ai_type == AIType.MCTS:
+            self.ai_red = MCTSAI(Player.RED)
         else:
             self.ai_red = None
             
         if blue_ai_type == AIType.SMART:
             heuristic = blue_heuristic or ChainReactionHeuristics.threat_analysis_heuristic
-            self.ai_blue = MinimaxAI(Player.BLUE, depth=depth, heuristic_func=heuristic)
+            self.ai_blue = MinimaxAI(Player.BLUE, depth=depth, heuristic_func=heuristic, keep_table=True)
         elif blue_ai_type == AIType.RANDOM:
             self.ai_blue = RandomAI(Player.BLUE)
+        elif blue_ai_type == AIType.MCTS:
+            self.ai_blue = MCTSAI(Player.BLUE)
         else:
             self.ai_blue = None
         
@@ -961,7 +1746,7 @@ class GameController:
                     continue
                     
                 if not self.game.is_valid_move(row, col, player):
-                    cell = self.game.board[row][col]
+                    cell = self.game.cell(row, col)
                     if cell.player != Player.EMPTY and cell.player != player:
                         print(f"❌ That cell belongs to {cell.player.value}! You can only place on empty cells or your own cells.")
                     continue
@@ -1012,13 +1797,8 @@ class GameController:
                 else:
                     ai_type_name = blue_ai_type.value
                     print(f"\n🤖 {ai_type_name} ({current_player.value}) is thinking...")
-                    if blue_ai_type == AIType.SMART:
-                        heuristic = blue_heuristic or ChainReactionHeuristics.threat_analysis_heuristic
-                        ai_instance = MinimaxAI(Player.BLUE, depth, heuristic_func=heuristic)
-                    else:
-                        ai_instance = RandomAI(Player.BLUE)
-                    
-                    move = ai_instance.get_best_move(self.game)
+                    #the AIs from initialize_game, kept across moves so tables and trees carry over
+                    move = self.ai_blue.get_best_move(self.game)
                     if move and self.game.make_move(move[0], move[1], current_player):
                         print(f"{ai_type_name} plays: {move[0]}, {move[1]}")
                         self.game.save_to_file(self.game_state_file, f"{ai_type_name} Move")
@@ -1029,19 +1809,11 @@ class GameController:
             elif mode == GameMode.AI_VS_AI:
                 if current_player == Player.RED:
                     ai_type_name = red_ai_type.value
-                    if red_ai_type == AIType.SMART:
-                        heuristic = red_heuristic or ChainReactionHeuristics.growth_potential_heuristic
-                        ai_instance = MinimaxAI(Player.RED, depth, heuristic_func=heuristic)
-                    else:
-                        ai_instance = RandomAI(Player.RED)
+                    ai_instance = self.ai_red
                 else:
                     ai_type_name = blue_ai_type.value
-                    if blue_ai_type == AIType.SMART:
-                        heuristic = blue_heuristic or ChainReactionHeuristics.threat_analysis_heuristic
-                        ai_instance = MinimaxAI(Player.BLUE, depth, heuristic_func=heuristic)
-                    else:
-                        ai_instance = RandomAI(Player.BLUE)
-                
+                    ai_instance = self.ai_blue
+                                
                 print(f"\n🤖 {ai_type_name} ({current_player.value}) is thinking...")
                 move = ai_instance.get_best_move(self.game)
                 
@@ -0,0 +1,202 @@
+from functools import cached_property
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from improved_chain_reaction import (BoardGeometry, ChainReactionGame, ChainReactionHeuristics, Player,
+                                     board_geometry, player_sign)
+
+#NumPy versions of ChainReactionHeuristics. Boards come in as a batch of signed cell arrays
+#(positive Red, negative Blue), shape (N, rows, cols) or (N, rows * cols), or as the bytes of
+#several ChainReactionGame.cells arrays joined together; BoardFeatures turns
+#them into the player's view once and every heuristic is a reduction over its shared features.
+#Scores match the loop versions up to float summation order.
+
+class _BoardTables:
+    """BoardGeometry's per-cell lists as (rows, cols) arrays"""
+
+    def __init__(self, geometry: BoardGeometry):
+        shape = (geometry.rows, geometry.cols)
+        self.critical = np.array(geometry.critical, dtype=np.int16).reshape(shape)
+        self.strategic_own = np.array(geometry.strategic_own).reshape(shape)
+        self.strategic_opponent = np.array(geometry.strategic_opponent).reshape(shape)
+        self.growth = np.array(geometry.growth_values, dtype=np.float64).reshape(shape)
+
+_board_tables = {}
+
+def _tables(rows: int, cols: int) -> _BoardTables:
+    key = (rows, cols)
+    if key not in _board_tables:
+        _board_tables[key] = _BoardTables(board_geometry(rows, cols))
+    return _board_tables[key]
+
+def _neighbor_sum(values):
+    """Sum of each cell's up/down/left/right neighbors, from shifted copies of the batch"""
+    total = np.zeros_like(values)
+    total[:, 1:, :] += values[:, :-1, :]
+    total[:, :-1, :] += values[:, 1:, :]
+    total[:, :, 1:] += values[:, :, :-1]
+    total[:, :, :-1] += values[:, :, 1:]
+    return total
+
+class BoardFeatures:
+    """Features shared by the heuristics, for a batch of boards seen from one player"""
+
+    def __init__(self, boards, rows: int, cols: int, player: Player, move_count=0):
+        if np is None:
+            raise ImportError("vectorized heuristics need numpy; use ChainReactionHeuristics instead")
+        tables = _tables(rows, cols)
+        self.rows = rows
+        self.cols = cols
+        self.tables = tables
+        self.critical = tables.critical
+        if isinstance(boards, (bytes, bytearray)):
+            #concatenated ChainReactionGame.cells buffers
+            boards = np.frombuffer(boards, dtype=np.int8)
+        #signed orbs from the player's view: positive own, negative opponent
+        self.view = np.asarray(boards, dtype=np.int16).reshape(-1, rows, cols) * player_sign(player)
+        self.move_count = np.broadcast_to(np.asarray(move_count), (len(self.view),))
+
+    @cached_property
+    def own(self):
+        return self.view > 0
+
+    @cached_property
+    def opponent(self):
+        return self.view < 0
+
+    @cached_property
+    def orbs(self):
+        return np.abs(self.view)
+
+    @cached_property
+    def own_orbs(self):
+        return np.where(self.own, self.view, 0)
+
+    @cached_property
+    def opponent_orbs(self):
+        return np.where(self.opponent, -self.view, 0)
+
+    @cached_property
+    def to_critical(self):
+        """Orbs each cell still needs before it explodes"""
+        return self.critical - self.orbs
+
+    @cached_property
+    def fill(self):
+        """Orbs as a fraction of critical mass"""
+        return self.orbs / self.critical
+
+    @cached_property
+    def own_neighbors(self):
+        return _neighbor_sum(self.own.astype(np.int16))
+
+    @cached_property
+    def opponent_neighbors(self):
+        return _neighbor_sum(self.opponent.astype(np.int16))
+
+    @cached_property
+    def frontier(self):
+        """Empty cells next to one of the player's cells"""
+        return (self.view == 0) & (self.own_neighbors > 0)
+
+def _total(values):
+    return values.reshape(len(values), -1).sum(axis=1)
+
+def orb_count(features: BoardFeatures):
+    return _total(features.view).astype(np.float64)
+
+def explosion_potential(features: BoardFeatures):
+    near_critical = features.to_critical == 1
+    own_score = (50 * near_critical + (15 * features.opponent_neighbors + 5 * features.own_neighbors) * features.fill)
+    return _total(np.where(features.own, own_score, 0) - np.where(features.opponent & near_critical, 60, 0))
+
+def strategic_control(features: BoardFeatures):
+    tables = features.tables
+    return _total(np.where(features.own, tables.strategic_own, 0) -
+                  np.where(features.opponent, tables.strategic_opponent, 0))
+
+def growth_potential(features: BoardFeatures):
+    safety = -40 * _neighbor_sum(np.where(features.opponent, features.fill, 0))
+    return _total(np.where(features.frontier, np.maximum(0, features.tables.growth + safety), 0))
+
+def threat_analysis(features: BoardFeatures):
+    opponent, fill = features.opponent, features.fill
+    immediate = opponent & (features.to_critical == 1)
+    potential = opponent & ~immediate & (features.orbs >= features.critical * 0.7)
+    score = (np.where(immediate, np.where(features.own_neighbors > 0, -25, -50), 0)
+             - np.where(potential, 20 * fill, 0)
+             + np.where(features.own, np.minimum(30, 2 * _neighbor_sum(features.own_orbs)), 0))
+    threat_ratio = (3 * _total(immediate) + _total(potential)) / max(1, features.rows * features.cols)
+    return _total(score) - 100 * threat_ratio
+
+def tempo(features: BoardFeatures):
+    forcing = features.to_critical == 2
+    player_development = _total(features.own_orbs)
+    opponent_development = _total(features.opponent_orbs)
+    score = 40.0 * (_total(features.own & forcing) - _total(features.opponent & forcing))
+    development_ratio = player_development / np.maximum(1, opponent_development)
+    with np.errstate(divide='ignore'):
+        score += np.where(development_ratio > 0, np.log(development_ratio) * 30, 0)
+    #Late-game adjustment
+    late = player_development + opponent_development > features.rows * features.cols * 2
+    if late.any():
+        score += np.where(late, orb_count(features) * 0.5 + explosion_potential(features) * 0.3, 0)
+    return score
+
+#combined_heuristic_v2's weights by game phase
+_PHASE_WEIGHTS = (
+    (10, {strategic_control: 0.4, growth_potential: 0.3, tempo: 0.2, threat_analysis: 0.1}),
+    (30, {explosion_potential: 0.3, threat_analysis: 0.3, strategic_control: 0.2, tempo: 0.2}),
+    (math.inf, {explosion_potential: 0.5, threat_analysis: 0.3, orb_count: 0.2}),
+)
+
+def combined_v2(features: BoardFeatures):
+    move_count = features.move_count
+    score = np.zeros(len(features.view))
+    lower = -math.inf
+    for upper, weights in _PHASE_WEIGHTS:
+        phase = (move_count >= lower) & (move_count < upper)
+        lower = upper
+        if phase.any():
+            score += np.where(phase, sum(weight * heuristic(features) for heuristic, weight in weights.items()), 0)
+    return score
+
+#Batched counterpart of each ChainReactionHeuristics function
+BATCHED = {
+    ChainReactionHeuristics.orb_count_heuristic: orb_count,
+    ChainReactionHeuristics.explosion_potential_heuristic: explosion_potential,
+    ChainReactionHeuristics.strategic_control_heuristic: strategic_control,
+    ChainReactionHeuristics.growth_potential_heuristic: growth_potential,
+    ChainReactionHeuristics.threat_analysis_heuristic: threat_analysis,
+    ChainReactionHeuristics.tempo_heuristic: tempo,
+    ChainReactionHeuristics.combined_heuristic_v2: combined_v2,
+}
+
+def score_boards(heuristic_func, boards, rows: int, cols: int, player: Player, move_count=0):
+    """Scores of a batch of boards under the batched version of a ChainReactionHeuristics function"""
+    return BATCHED[heuristic_func](BoardFeatures(boards, rows, cols, player, move_count))
+
+def _single(batched, name: str):
+    def heuristic(game: ChainReactionGame, player: Player) -> float:
+        features = BoardFeatures(np.frombuffer(game.cells, dtype=np.int8), game.rows, game.cols, player, game.move_count)
+        return float(batched(features)[0])
+    #named after the class attribute so the function pickles by reference, e.g. for parallel search
+    heuristic.__name__ = name
+    heuristic.__qualname__ = f"VectorizedHeuristics.{name}"
+    return heuristic
+
+class VectorizedHeuristics:
+    """Drop-in (game, player) versions of the ChainReactionHeuristics functions"""
+    orb_count_heuristic = staticmethod(_single(orb_count, 'orb_count_heuristic'))
+    explosion_potential_heuristic = staticmethod(_single(explosion_potential, 'explosion_potential_heuristic'))
+    strategic_control_heuristic = staticmethod(_single(strategic_control, 'strategic_control_heuristic'))
+    growth_potential_heuristic = staticmethod(_single(growth_potential, 'growth_potential_heuristic'))
+    threat_analysis_heuristic = staticmethod(_single(threat_analysis, 'threat_analysis_heuristic'))
+    tempo_heuristic = staticmethod(_single(tempo, 'tempo_heuristic'))
+    combined_heuristic_v2 = staticmethod(_single(combined_v2, 'combined_heuristic_v2'))
+
+BATCHED.update({getattr(VectorizedHeuristics, heuristic.__name__): batched for heuristic, batched in list(BATCHED.items())})
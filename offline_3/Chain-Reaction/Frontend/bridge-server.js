@@ -447,6 +447,8 @@ async function startPythonBackend(config) {
       backendAiType = 'Smart';
     } else if (config.aiType === 'RANDOM') {
       backendAiType = 'Random';
+    } else if (config.aiType === 'MCTS') {
+      backendAiType = 'MCTS';
     }
 
     //Convert firstPlayer names
@@ -476,24 +478,28 @@ async function startPythonBackend(config) {
         rows: config.rows,
         cols: config.cols,
         mode: backendMode,
-        redAI: config.redAI.type === 'MINIMAX' ? 
+        redAI: config.redAI.type === 'MINIMAX' || config.redAI.type === 'MCTS' ? 
           {
-            type: 'Smart',
+            type: config.redAI.type === 'MCTS' ? 'MCTS' : 'Smart',
             difficulty: config.redAI.difficulty === 'EASY' ? 'Easy' : 
                         config.redAI.difficulty === 'MEDIUM' ? 'Medium' : 
                         config.redAI.difficulty === 'HARD' ? 'Hard' : 'Medium',
-            heuristic: config.redAI.heuristic || 'combined_v2'
+            heuristic: config.redAI.heuristic || 'combined_v2',
+            rollout: config.redAI.rollout,
+            timeBudgetMs: config.redAI.timeBudgetMs ?? config.timeBudgetMs
           } : 
           {
             type: 'Random'
           },
-        blueAI: config.blueAI.type === 'MINIMAX' ? 
+        blueAI: config.blueAI.type === 'MINIMAX' || config.blueAI.type === 'MCTS' ? 
           {
-            type: 'Smart',
+            type: config.blueAI.type === 'MCTS' ? 'MCTS' : 'Smart',
             difficulty: config.blueAI.difficulty === 'EASY' ? 'Easy' : 
                         config.blueAI.difficulty === 'MEDIUM' ? 'Medium' : 
                         config.blueAI.difficulty === 'HARD' ? 'Hard' : 'Medium',
-            heuristic: config.blueAI.heuristic || 'orb_count'
+            heuristic: config.blueAI.heuristic || 'orb_count',
+            rollout: config.blueAI.rollout,
+            timeBudgetMs: config.blueAI.timeBudgetMs ?? config.timeBudgetMs
           } : 
           {
             type: 'Random'
@@ -518,7 +524,9 @@ async function startPythonBackend(config) {
           aiType: backendAiType || 'Smart',
           difficulty: backendDifficulty || 'Medium',
           firstPlayer: backendFirstPlayer || 'Human',
-          heuristic: config.heuristic || 'combined_v2'
+          heuristic: config.heuristic || 'combined_v2',
+          rollout: config.rollout,
+          timeBudgetMs: config.timeBudgetMs
         });
       }
     }